@@ -1,8 +1,11 @@
 """Main paste workflow - orchestrates the entire conversion and insertion process."""
 
+import atexit
 import traceback
 import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from ...utils.win32.detector import detect_active_app
 from ...utils.clipboard import get_clipboard_text, is_clipboard_empty
@@ -17,11 +20,31 @@ from ...domains.spreadsheet.wps_excel import WPSExcelInserter
 from ...domains.notification.manager import NotificationManager
 from ...utils.fs import generate_output_path
 from ...utils.logging import log
+from ...core.constants import NOTIFICATION_DEDUP_SEC
 from ...core.state import app_state
 from ...core.errors import ClipboardError, PandocError, InsertError
 from ...utils.win32.memfile import EphemeralFile
 
 
+class _ThrottledNotifier:
+    """通知去重包装：时间窗口内重复的相同通知只发送一次（连续按热键时避免刷屏）"""
+
+    def __init__(self, notifier: NotificationManager, window: float = NOTIFICATION_DEDUP_SEC):
+        self._notifier = notifier
+        self._window = window
+        self._last_key = None
+        self._last_time = 0.0
+
+    def notify(self, title: str, message: str, ok: bool = True) -> None:
+        now = time.monotonic()
+        key = (title, message, ok)
+        if key == self._last_key and now - self._last_time < self._window:
+            return
+        self._last_key = key
+        self._last_time = now
+        self._notifier.notify(title, message, ok=ok)
+
+
 class PasteWorkflow:
     """转换并插入工作流 - 业务流程编排"""
     
@@ -30,14 +53,18 @@ class PasteWorkflow:
         self.wps_inserter = WPSInserter()
         self.ms_excel_inserter = MSExcelInserter()
         self.wps_excel_inserter = WPSExcelInserter()
-        self.notification_manager = NotificationManager()
+        self.notification_manager = _ThrottledNotifier(NotificationManager())
         self.pandoc_integration = None  # 延迟初始化
+        # 临时文件清理放到单独的后台线程，不阻塞结果通知
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FileCleanup")
+        atexit.register(self._cleanup_executor.shutdown, wait=True)
     
     def execute(self) -> None:
         """执行完整的转换和插入流程"""
         try:
-            # 1. 检查剪贴板
-            if is_clipboard_empty():
+            # 1. 读取并检查剪贴板（只读取一次）
+            md_text = get_clipboard_text()
+            if is_clipboard_empty(md_text):
                 self.notification_manager.notify(
                     "MD2DOCX HotPaste",
                     "剪贴板为空，未处理。",
@@ -45,8 +72,7 @@ class PasteWorkflow:
                 )
                 return
             
-            # 2. 获取剪贴板内容和配置
-            md_text = get_clipboard_text()
+            # 2. 获取配置
             config = app_state.config
             
             # 3. 检测当前活动应用
@@ -151,24 +177,28 @@ class PasteWorkflow:
         # 1. 处理LaTeX公式
         md_text = convert_latex_delimiters(md_text)
 
-        # 2. 生成DOCX字节流
+        # 2. 生成DOCX字节流（文本原样交给 Pandoc 集成，只在走子进程时编码一次）
         self._ensure_pandoc_integration()
         docx_bytes = self.pandoc_integration.convert_to_docx_bytes(
             md_text=md_text,
             reference_docx=config.get("reference_docx")
         )
+
+        # 3. 插入：写入临时文件并在插入后异步删除
         temp_dir = config.get("temp_dir")  # 可选：支持 RAM 盘目录
-        with EphemeralFile(suffix=".docx", dir_=temp_dir) as eph:
+        eph = EphemeralFile(suffix=".docx", dir_=temp_dir)
+        try:
             eph.write_bytes(docx_bytes)
-            # 插入
             inserted = self._perform_word_insertion(eph.path, target)
+        finally:
+            self._schedule_cleanup(eph)
 
-        # 3. 保存文件
+        # 4. 保存文件（在插入之后，保存目录较慢或不可用时不影响粘贴）
         if config.get("keep_file", False):
-            # 2. 生成输出路径
+            # 生成输出路径
             try:
                 output_path = generate_output_path(
-                    keep_file=config.get("keep_file", False),
+                    keep_file=True,
                     save_dir=config.get("save_dir", "")
                 )
                 with open(output_path, "wb") as f:
@@ -181,15 +211,24 @@ class PasteWorkflow:
                     "保存文档失败。",
                     ok=False
                 )
-        
-        # 4. 显示结果通知
+
+        # 5. 显示结果通知
         self._show_word_result(target, inserted)
     
+    def _schedule_cleanup(self, eph: EphemeralFile) -> None:
+        """在后台线程中删除临时文件；解释器退出时执行器已关闭，则直接同步删除"""
+        try:
+            self._cleanup_executor.submit(eph.cleanup)
+        except RuntimeError:
+            eph.cleanup()
+    
     def _ensure_pandoc_integration(self) -> None:
         """确保 Pandoc 集成已初始化"""
         if self.pandoc_integration is None:
             pandoc_path = app_state.config.get("pandoc_path", "pandoc")
             self.pandoc_integration = PandocIntegration(pandoc_path)
+        # 读取器选项每次按当前配置设置，重载配置后立即生效
+        self.pandoc_integration.use_commonmark = bool(app_state.config.get("commonmark_reader", False))
     
     def _perform_word_insertion(self, docx_path: str, target: str) -> bool:
         """
@@ -16,7 +16,8 @@ if os.path.exists(os.path.join(os.path.dirname(sys.executable), "pandoc", "pando
         "notify": True,
         "enable_excel": True,  # 是否启用智能识别 Markdown 表格并粘贴到 Excel
         "excel_keep_format": True,  # Excel 粘贴时是否保留格式（粗体、斜体等）
-        "auto_open_on_no_app": True  # 当未检测到应用时，自动创建文件并用默认应用打开
+        "auto_open_on_no_app": True,  # 当未检测到应用时，自动创建文件并用默认应用打开
+        "commonmark_reader": False  # 不含 raw TeX / HTML 时改用更快的 commonmark_x 读取器（部分 Pandoc 语法会不同）
     }
 else:
     DEFAULT_CONFIG = {
@@ -28,5 +29,6 @@ else:
         "notify": True,
         "enable_excel": True,  # 是否启用智能识别 Markdown 表格并粘贴到 Excel
         "excel_keep_format": True,  # Excel 粘贴时是否保留格式（粗体、斜体等）
-        "auto_open_on_no_app": True  # 当未检测到应用时，自动创建文件并用默认应用打开
+        "auto_open_on_no_app": True,  # 当未检测到应用时，自动创建文件并用默认应用打开
+        "commonmark_reader": False  # 不含 raw TeX / HTML 时改用更快的 commonmark_x 读取器（部分 Pandoc 语法会不同）
     }
@@ -2,21 +2,25 @@
 
 import os
 import sys
+from functools import lru_cache
+
+
+# 项目根目录：从 md2docx_hotpaste/config/paths.py 回到 md2docx_hotpaste/ 的上一级（导入时计算一次）
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def get_base_dir() -> str:
     """获取应用程序基础目录"""
     # 返回项目根目录（md2docx_hotpaste）
-    current_file = os.path.abspath(__file__)
-    # 从 md2docx_hotpaste/config/paths.py 回到 md2docx_hotpaste/
-    return os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
+    return _BASE_DIR
 
 
+@lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
-    """获取资源文件路径（支持 PyInstaller）"""
+    """获取资源文件路径（支持 PyInstaller；基础目录在进程内固定，结果会被缓存）"""
     if hasattr(sys, "_MEIPASS"):
         return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(get_base_dir(), relative_path)
+    return os.path.join(_BASE_DIR, relative_path)
 
 
 def get_user_data_dir() -> str:
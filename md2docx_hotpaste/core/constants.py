@@ -10,9 +10,14 @@ WORD_INSERT_RETRY_DELAY = 0.3  # 秒
 # 默认通知超时时间
 NOTIFICATION_TIMEOUT = 3
 
-# 清理等待时间
-CLEANUP_DELAY = 1.0  # 秒
+# 相同通知的去重时间窗口（秒）
+NOTIFICATION_DEDUP_SEC = 0.5
 
-# 缓存删除相关
-DEFAULT_DELETE_RETRY = 3
-DEFAULT_DELETE_WAIT  = 0.05
+# 缓存删除相关：首次删除失败（文件被占用）后的退避等待序列（秒）
+DEFAULT_DELETE_BACKOFF = (0.02, 0.05, 0.1)
+
+# 配置保存合并窗口（秒）：窗口内的多次保存只写盘一次
+CONFIG_SAVE_DELAY = 0.5
+
+# Pandoc 常驻服务（pandoc server）单次转换请求的超时时间（秒）
+PANDOC_SERVER_TIMEOUT = 30
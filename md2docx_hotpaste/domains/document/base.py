@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, List, Union
 
-from ...utils.com import ensure_com
+from ...utils.com import ensure_com, order_prog_ids
 
 
 class BaseDocumentInserter(ABC):
@@ -21,6 +21,12 @@ class BaseDocumentInserter(ABC):
         self.prog_ids = [prog_id] if isinstance(prog_id, str) else prog_id
         self.prog_id = self.prog_ids[0]  # 保持向后兼容
         self.app_name = app_name
+        # 上次成功连接的 ProgID，下次优先尝试
+        self._last_prog_id = None
+    
+    def _ordered_prog_ids(self) -> List[str]:
+        """返回按尝试顺序排列的 ProgID（上次成功的优先）"""
+        return order_prog_ids(self.prog_ids, self._last_prog_id)
     
     @ensure_com
     @abstractmethod
@@ -5,7 +5,7 @@ import win32com.client
 from win32com.client import gencache
 
 from .base import BaseDocumentInserter
-from ...utils.com import ensure_com
+from ...utils.com import early_bound, ensure_com
 from ...utils.logging import log
 from ...core.constants import WORD_INSERT_RETRY_COUNT, WORD_INSERT_RETRY_DELAY
 from ...core.errors import InsertError
@@ -112,11 +112,14 @@ class WordInserter(BaseWordInserter):
     def _get_application(self):
         """获取 Word 应用程序实例（尝试所有可能的 ProgID）"""
         # 尝试所有可能的 ProgID
-        for prog_id in self.prog_ids:
+        for prog_id in self._ordered_prog_ids():
             try:
                 # 尝试连接现有的 Word 实例
                 app = win32com.client.GetActiveObject(prog_id)
                 log(f"Successfully connected to Word via {prog_id}")
+                self._last_prog_id = prog_id
+                # 早期绑定：已有生成的包装类时 DISPID 由其提供，Selection/InsertFile 等调用不再每次 GetIDsOfNames
+                app = early_bound(app)
                 self._ensure_app_ready(app)
                 return app
             except Exception:
@@ -124,6 +127,7 @@ class WordInserter(BaseWordInserter):
                     # 尝试创建新实例
                     app = gencache.EnsureDispatch(prog_id)
                     log(f"Successfully created Word instance via {prog_id}")
+                    self._last_prog_id = prog_id
                     self._ensure_app_ready(app)
                     return app
                 except Exception as e:
@@ -50,17 +50,19 @@ class WPSInserter(BaseWordInserter):
 
     def _get_application(self):
         """获取 WPS 应用程序实例（尝试所有可能的 ProgID）"""
-        for prog_id in self.prog_ids:
+        for prog_id in self._ordered_prog_ids():
             try:
                 # 尝试连接现有实例
                 app = win32com.client.GetActiveObject(prog_id)
                 log(f"Successfully connected to WPS via {prog_id}")
+                self._last_prog_id = prog_id
                 return app
             except Exception:
                 try:
                     # 尝试创建新实例
                     app = win32com.client.Dispatch(prog_id)
                     log(f"Successfully created WPS instance via {prog_id}")
+                    self._last_prog_id = prog_id
                     return app
                 except Exception as e:
                     log(f"Cannot get WPS application via {prog_id}: {e}")
@@ -48,6 +48,27 @@ class HotkeyManager:
                 self.listener = None
                 self.current_hotkey = None
     
+    def rebind(self, hotkey: str, callback: Callable[[], None]) -> None:
+        """
+        更换热键组合：先校验，再重启监听器
+        
+        新热键格式错误时保持原绑定不变。注意：重启会卸载并重新安装键盘钩子；
+        GlobalHotKeys 没有替换热键组合的公开接口，原地替换只能改写其私有属性，故不采用
+        
+        Args:
+            hotkey: 新热键字符串
+            callback: 热键触发时的回调函数
+        """
+        try:
+            keyboard.HotKey.parse(hotkey)
+        except Exception as e:
+            log(f"Failed to bind hotkey {hotkey}: {e}")
+            raise
+        
+        old_hotkey = self.current_hotkey
+        self.bind(hotkey, callback)
+        log(f"Hotkey rebound: {old_hotkey} -> {hotkey}")
+    
     def restart(self, hotkey: str, callback: Callable[[], None]) -> None:
         """重启热键绑定"""
         self.unbind()
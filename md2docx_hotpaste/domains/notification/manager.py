@@ -62,6 +62,8 @@ class NotificationManager:
     def __init__(self, app_name: str = "MD2DOCX HotPaste", max_queue: int = 30):
         self.app_name = app_name
         self.icon_path = get_app_icon_path()
+        # 图标文件在运行期间不会变化，存在性只检查一次
+        self._icon_arg = _icon_or_none(self.icon_path)
         self._q: "queue.Queue[tuple[str,str,bool]]" = queue.Queue(maxsize=max_queue)
         self._stop = threading.Event()
         self._worker = threading.Thread(target=self._worker_loop, name="NotifyWorker", daemon=True)
@@ -141,7 +143,7 @@ class NotificationManager:
                     title,
                     message,
                     app_id="RichQAQ.MD2DOCX_HotPaste",
-                    icon=_icon_or_none(self.icon_path),
+                    icon=self._icon_arg,
                     duration=_secs_to_win11_duration(NOTIFICATION_TIMEOUT),
                 )
                 return
@@ -154,7 +156,7 @@ class NotificationManager:
                 _win10_toaster.show_toast(
                     title,
                     message,
-                    icon_path=_icon_or_none(self.icon_path),
+                    icon_path=self._icon_arg,
                     duration=int(NOTIFICATION_TIMEOUT) if NOTIFICATION_TIMEOUT else 5,
                     threaded=True,   # 本身非阻塞
                 )
@@ -169,7 +171,7 @@ class NotificationManager:
                     title=title,
                     message=message,
                     timeout=NOTIFICATION_TIMEOUT,
-                    app_icon=self.icon_path if os.path.exists(self.icon_path) else None,
+                    app_icon=self._icon_arg,
                 )
             except Exception as e:
                 log(f"plyer notify error: {e}")
@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Any, List, Union
 
+from ...utils.com import order_prog_ids
+
 
 class BaseTableInserter(ABC):
     """表格插入器基类（用于 Excel/WPS 表格）"""
@@ -19,6 +21,12 @@ class BaseTableInserter(ABC):
         self.prog_ids = [prog_id] if isinstance(prog_id, str) else prog_id
         self.prog_id = self.prog_ids[0]  # 保持向后兼容
         self.app_name = app_name
+        # 上次成功连接的 ProgID，下次优先尝试
+        self._last_prog_id = None
+    
+    def _ordered_prog_ids(self) -> List[str]:
+        """返回按尝试顺序排列的 ProgID（上次成功的优先）"""
+        return order_prog_ids(self.prog_ids, self._last_prog_id)
     
     @abstractmethod
     def insert(self, table_data: List[List[str]], keep_format: bool = True) -> bool:
@@ -1,15 +1,203 @@
 """Excel and WPS spreadsheet inserters."""
 
-from typing import List
+from typing import Iterator, List
+
+import win32com.client
+from pywintypes import com_error
+
 from .base import BaseTableInserter
-from .formatting import CellFormat
+from .formatting import (
+    CellFormat,
+    KIND_CODE_BLOCK,
+    KIND_PLAIN,
+    KIND_RICH,
+    KIND_RICH_LINK,
+    KIND_SINGLE_LINK,
+    KIND_SINGLE_STYLE,
+    is_plain_text,
+    strip_markdown,
+)
 from ...core.errors import InsertError
+from ...utils.com import co_initialize, co_uninitialize, early_bound
 from ...utils.logging import log
 
 
+# 插入期间临时关闭的应用属性及其取值（屏幕刷新、自动计算、事件）
+_SUSPENDED_APP_SETTINGS = (
+    ("ScreenUpdating", False),
+    ("Calculation", -4135),  # xlCalculationManual
+    ("EnableEvents", False),
+)
+
+# 多区域地址字符串（如 "A1,B3,C5"）的长度上限
+_MAX_RANGE_ADDRESS_LEN = 255
+
+
+def _cell_address(row: int, col: int) -> str:
+    """将行列号转换为 A1 样式地址"""
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return f"{letters}{row}"
+
+
+def _join_addresses(addresses: List[str]) -> Iterator[str]:
+    """将单元格地址拼接为不超过长度上限的多区域地址字符串"""
+    chunk = []
+    length = 0
+    for addr in addresses:
+        if chunk and length + len(addr) + 1 > _MAX_RANGE_ADDRESS_LEN:
+            yield ",".join(chunk)
+            chunk = []
+            length = 0
+        chunk.append(addr)
+        length += len(addr) + 1
+    if chunk:
+        yield ",".join(chunk)
+
+
+def _format_wrap(rng) -> None:
+    rng.WrapText = True
+
+
+def _format_code_block(rng) -> None:
+    # 代码块使用等宽字体、浅灰色背景，顶部对齐
+    rng.Font.Name = "Consolas"
+    rng.Interior.Color = 0xF0F0F0  # 浅灰色
+    rng.WrapText = True
+    rng.VerticalAlignment = -4160  # xlTop
+
+
+def _format_bold(rng) -> None:
+    rng.Font.Bold = True
+
+
+def _format_italic(rng) -> None:
+    rng.Font.Italic = True
+
+
+def _format_strikethrough(rng) -> None:
+    rng.Font.Strikethrough = True
+
+
+def _format_code(rng) -> None:
+    rng.Font.Name = "Consolas"
+    rng.Interior.Color = 0xF0F0F0  # 浅灰色
+
+
+def _merge_runs(segments: list) -> List[tuple]:
+    """
+    合并相邻且格式相同的片段，减少 GetCharacters 及字体属性设置的 COM 调用
+    
+    缓存中的片段会被多个单元格共享，这里只计算长度，不修改片段本身
+    
+    Returns:
+        [(字符数, 代表片段), ...]，空片段已跳过
+    """
+    runs = []
+    last_key = None
+    for segment in segments:
+        if not segment.text:
+            continue
+        key = (segment.bold, segment.italic, segment.strikethrough, segment.is_code)
+        if key == last_key:
+            runs[-1][0] += len(segment.text)
+        else:
+            runs.append([len(segment.text), segment])
+            last_key = key
+    return runs
+
+
+# 可整格设置的格式：分组名 -> 设置函数
+_GROUP_FORMATTERS = {
+    "wrap": _format_wrap,
+    "code_block": _format_code_block,
+    "bold": _format_bold,
+    "italic": _format_italic,
+    "strikethrough": _format_strikethrough,
+    "code": _format_code,
+}
+
+
+def _apply_single_link(add_hyperlink, cell, cell_format, clean_text: str) -> None:
+    """整个单元格是一个超链接：直接使用 Hyperlinks.Add"""
+    segment = cell_format.segments[0]
+    try:
+        add_hyperlink(
+            Anchor=cell,
+            Address=segment.hyperlink_url,
+            TextToDisplay=segment.text
+        )
+    except com_error as e:
+        log(f"Failed to add hyperlink: {e}")
+
+
+def _apply_rich_link(add_hyperlink, cell, cell_format, clean_text: str) -> None:
+    """
+    含超链接的多片段单元格：只添加超链接，不设置富文本格式
+    
+    Hyperlinks.Add 和 GetCharacters 不兼容；Excel 单元格只能有一个超链接，这里取第一个
+    """
+    for segment in cell_format.segments:
+        if segment.hyperlink_url:
+            try:
+                add_hyperlink(
+                    Anchor=cell,
+                    Address=segment.hyperlink_url,
+                    TextToDisplay=clean_text
+                )
+                break
+            except com_error as e:
+                log(f"Failed to add hyperlink: {e}")
+    
+    # 如果有行内代码,设置整个单元格背景
+    if cell_format.has_inline_code:
+        cell.Interior.Color = 0xF0F0F0  # 浅灰色
+
+
+def _apply_rich(add_hyperlink, cell, cell_format, clean_text: str) -> None:
+    """无超链接的多片段单元格：用 GetCharacters 逐段设置字体"""
+    char_index = 1  # Excel 字符索引从1开始
+    
+    # 相邻的同格式片段合并为一段；无格式的段不需要任何 COM 调用
+    get_characters = cell.GetCharacters
+    for seg_len, segment in _merge_runs(cell_format.segments):
+        if segment.is_code or segment.bold or segment.italic or segment.strikethrough:
+            # 获取字符范围，Font 只取一次
+            font = get_characters(char_index, seg_len).Font
+            
+            # 应用格式（只设置为 True 的属性）
+            if segment.is_code:
+                font.Name = "Consolas"
+            if segment.bold:
+                font.Bold = True
+            if segment.italic:
+                font.Italic = True
+            if segment.strikethrough:
+                font.Strikethrough = True
+        
+        char_index += seg_len
+    
+    # 如果有行内代码,设置整个单元格背景
+    if cell_format.has_inline_code:
+        cell.Interior.Color = 0xF0F0F0  # 浅灰色
+
+
+# 需要逐个单元格处理的格式类别 -> 处理函数
+_RICH_TEXT_APPLIERS = {
+    KIND_SINGLE_LINK: _apply_single_link,
+    KIND_RICH: _apply_rich,
+    KIND_RICH_LINK: _apply_rich_link,
+}
+
+
 class BaseExcelInserter(BaseTableInserter):
     """Excel 表格插入器基类"""
     
+    # 是否在已有 makepy 包装类时将连接到的实例包装为早期绑定对象
+    early_bind = True
+    
     def insert(self, table_data: List[List[str]], keep_format: bool = True) -> bool:
         """
         将表格数据插入到 Excel 当前光标位置
@@ -24,12 +212,12 @@ class BaseExcelInserter(BaseTableInserter):
         Raises:
             InsertError: 插入失败时
         """
+        # 第一阶段：在接触 COM 之前完成全部单元格解析（纯 Python，不占用 Excel）
+        clean_data, format_info, cols_count = self._prepare_cells(table_data, keep_format)
+        
         try:
-            import pythoncom
-            from pywintypes import com_error
-            
-            # 初始化 COM
-            pythoncom.CoInitialize()
+            # 初始化 COM（线程已以其他模式初始化时无需也不能配对反初始化）
+            needs_uninit = co_initialize()
             
             try:
                 # 获取 Excel 应用实例
@@ -38,15 +226,8 @@ class BaseExcelInserter(BaseTableInserter):
                 raise InsertError(f"未找到运行中的 {self.app_name}，请先打开。错误: {e}")
             
             try:
-                # 保存原始设置
-                original_screen_updating = excel.ScreenUpdating
-                original_calculation = excel.Calculation
-                original_events = excel.EnableEvents
-
-                # 优化性能禁用屏幕更新、自动计算和事件
-                excel.ScreenUpdating = False
-                excel.Calculation = -4135  # xlCalculationManual
-                excel.EnableEvents = False
+                # 优化性能禁用屏幕更新、自动计算和事件（保存原始设置）
+                original_settings = self._suspend_app_settings(excel)
 
                 try:
                     # 获取当前活动的工作表
@@ -62,136 +243,30 @@ class BaseExcelInserter(BaseTableInserter):
                     start_row = start_cell.Row
                     start_col = start_cell.Column
 
-                    # 预处理数据：解析格式并准备批量数据
                     rows_count = len(table_data)
-                    cols_count = max(len(row) for row in table_data) if table_data else 0
-
-                    # 准备纯文本数据用于批量插入
-                    clean_data = []
-                    format_info = []  # 存储格式信息 [(row, col, cell_format, clean_text), ...]
-
-                    for i, row in enumerate(table_data):
-                        clean_row = []
-                        for j, cell_value in enumerate(row):
-                            if keep_format:
-                                cell_format = CellFormat(cell_value)
-                                clean_text = cell_format.parse()
-                                clean_row.append(clean_text)
-
-                                # 只有当单元格有格式时才记录
-                                if (cell_format.has_newline or
-                                    cell_format.is_code_block or
-                                    len(cell_format.segments) > 1 or
-                                    (len(cell_format.segments) == 1 and any([
-                                        cell_format.segments[0].bold,
-                                        cell_format.segments[0].italic,
-                                        cell_format.segments[0].strikethrough,
-                                        cell_format.segments[0].is_code,
-                                        cell_format.segments[0].hyperlink_url
-                                    ]))):
-                                    format_info.append((i, j, cell_format, clean_text))
-                            else:
-                                clean_row.append(self._clean_markdown_formatting(cell_value))
-
-                        # 补齐行长度
-                        while len(clean_row) < cols_count:
-                            clean_row.append('')
-                        clean_data.append(clean_row)
-
+                    
                     # 批量写入数据（显著提升性能）
                     end_row = start_row + rows_count - 1
                     end_col = start_col + cols_count - 1
+                    cells = sheet.Cells
                     target_range = sheet.Range(
-                        sheet.Cells(start_row, start_col),
-                        sheet.Cells(end_row, end_col)
+                        cells(start_row, start_col),
+                        cells(end_row, end_col)
                     )
-                    target_range.Value = clean_data
+                    # Value2 跳过货币/日期类型转换；嵌套元组按 SAFEARRAY 一次性封送
+                    grid = tuple(tuple(row) for row in clean_data)
+                    try:
+                        target_range.Value2 = grid
+                    except com_error as e:
+                        # 部分 WPS 版本不接受二维数组赋值，退回逐行写入（COM 调用次数为行数）
+                        log(f"Bulk write failed on {self.app_name}, writing row by row: {e}")
+                        for offset, row_values in enumerate(grid):
+                            row = start_row + offset
+                            sheet.Range(cells(row, start_col), cells(row, end_col)).Value2 = (row_values,)
 
                     # 应用格式（如果需要）
                     if keep_format and format_info:
-                        for i, j, cell_format, clean_text in format_info:
-                            cell = sheet.Cells(start_row + i, start_col + j)
-
-                            try:
-                                # 如果包含换行,启用单元格自动换行
-                                if cell_format.has_newline:
-                                    cell.WrapText = True
-                                
-                                if cell_format.is_code_block:
-                                    # 代码块使用等宽字体、浅灰色背景
-                                    cell.Font.Name = "Consolas"
-                                    cell.Interior.Color = 0xF0F0F0  # 浅灰色
-                                    cell.WrapText = True
-                                    # 设置垂直对齐为顶部
-                                    cell.VerticalAlignment = -4160  # xlTop
-                                else:
-                                    # 检查是否整个单元格都是一个超链接
-                                    if (len(cell_format.segments) == 1
-                                            and cell_format.segments[0].hyperlink_url
-                                            and not any([cell_format.segments[0].bold,
-                                                        cell_format.segments[0].italic,
-                                                        cell_format.segments[0].strikethrough])):
-                                        # 单个超链接,使用 Hyperlinks.Add
-                                        segment = cell_format.segments[0]
-                                        try:
-                                            sheet.Hyperlinks.Add(
-                                                Anchor=cell,
-                                                Address=segment.hyperlink_url,
-                                                TextToDisplay=segment.text
-                                            )
-                                        except com_error as e:
-                                            log(f"Failed to add hyperlink: {e}")
-                                    else:
-                                        char_index = 1  # Excel 字符索引从1开始
-                                        
-                                        # 检查是否有超链接(有超链接时不能使用 GetCharacters)
-                                        has_hyperlink = any(seg.hyperlink_url for seg in cell_format.segments)
-                                        
-                                        if has_hyperlink:
-                                            # 有超链接时,只设置文本,不设置富文本格式
-                                            # 因为 Hyperlinks.Add 和 GetCharacters 不兼容
-                                            for segment in cell_format.segments:
-                                                if segment.hyperlink_url:
-                                                    # 为链接部分添加超链接
-                                                    # 注意: Excel 单元格只能有一个超链接,这里取第一个
-                                                    try:
-                                                        sheet.Hyperlinks.Add(
-                                                            Anchor=cell,
-                                                            Address=segment.hyperlink_url,
-                                                            TextToDisplay=clean_text
-                                                        )
-                                                        break
-                                                    except com_error as e:
-                                                        log(f"Failed to add hyperlink: {e}")
-                                        else:
-                                            # 没有超链接,可以使用富文本格式
-                                            for segment in cell_format.segments:
-                                                if not segment.text:
-                                                    continue
-                                                
-                                                seg_len = len(segment.text)
-                                                # 获取字符范围
-                                                chars = cell.GetCharacters(char_index, seg_len)
-                                                
-                                                # 应用格式
-                                                if segment.is_code:
-                                                    chars.Font.Name = "Consolas"
-                                                if segment.bold:
-                                                    chars.Font.Bold = True
-                                                if segment.italic:
-                                                    chars.Font.Italic = True
-                                                if segment.strikethrough:
-                                                    chars.Font.Strikethrough = True
-                                                
-                                                char_index += seg_len
-                                        
-                                        # 如果有行内代码,设置整个单元格背景
-                                        if any(seg.is_code for seg in cell_format.segments):
-                                            cell.Interior.Color = 0xF0F0F0  # 浅灰色
-                                        
-                            except com_error as e:
-                                # 格式应用失败，记录但继续
-                                log(f"Failed to apply format to cell ({i},{j}): {e}")
+                        self._apply_formats(sheet, start_row, start_col, format_info)
 
                     # 选中插入的区域
                     target_range.Select()
@@ -201,12 +276,11 @@ class BaseExcelInserter(BaseTableInserter):
 
                 finally:
                     # 恢复原始设置
-                    excel.ScreenUpdating = original_screen_updating
-                    excel.Calculation = original_calculation
-                    excel.EnableEvents = original_events
+                    self._restore_app_settings(excel, original_settings)
 
             finally:
-                pythoncom.CoUninitialize()
+                if needs_uninit:
+                    co_uninitialize()
                 
         except InsertError:
             raise
@@ -214,6 +288,189 @@ class BaseExcelInserter(BaseTableInserter):
             log(f"Failed to insert table to {self.app_name}: {e}")
             raise InsertError(f"{self.app_name} 插入失败: {e}")
     
+    def _prepare_cells(self, table_data: List[List[str]], keep_format: bool) -> tuple:
+        """
+        解析所有单元格，生成批量写入的纯文本数据和需要设置格式的单元格列表
+        
+        Args:
+            table_data: 二维数组表格数据
+            keep_format: 是否保留 Markdown 格式
+            
+        Returns:
+            (clean_data, format_info, cols_count)，其中 format_info 为
+            [(row, col, cell_format, clean_text), ...]，行列号相对于起始单元格
+        """
+        cols_count = max(len(row) for row in table_data) if table_data else 0
+        
+        # 准备纯文本数据用于批量插入
+        clean_data = []
+        format_info = []  # 存储格式信息 [(row, col, cell_format, clean_text), ...]
+        
+        if not keep_format:
+            # 不保留格式：只需清除 Markdown 符号，不记录任何格式信息
+            clean = self._clean_markdown_formatting
+            for row in table_data:
+                clean_row = [clean(cell_value) for cell_value in row]
+                # 补齐行长度
+                clean_row.extend([''] * (cols_count - len(clean_row)))
+                clean_data.append(clean_row)
+            return clean_data, format_info, cols_count
+        
+        # 循环中用到的函数绑定到局部变量
+        plain = is_plain_text
+        record = format_info.append
+        
+        for i, row in enumerate(table_data):
+            clean_row = []
+            append = clean_row.append
+            for j, cell_value in enumerate(row):
+                # 纯文本单元格（最常见）不创建 CellFormat，也不进入格式阶段
+                if plain(cell_value):
+                    append(cell_value)
+                    continue
+                
+                cell_format = CellFormat(cell_value)
+                clean_text = cell_format.parse()
+                append(clean_text)
+                
+                # 只有当单元格有格式时才记录
+                if (cell_format.has_newline or
+                    cell_format.is_code_block or
+                    cell_format.has_any_format or
+                    len(cell_format.segments) > 1):
+                    record((i, j, cell_format, clean_text))
+            
+            # 补齐行长度
+            clean_row.extend([''] * (cols_count - len(clean_row)))
+            clean_data.append(clean_row)
+        
+        return clean_data, format_info, cols_count
+    
+    def _suspend_app_settings(self, excel) -> list:
+        """
+        关闭屏幕刷新、自动计算和事件
+        
+        每个属性单独处理：WPS 表格可能未实现其中某些属性，失败时跳过该项
+        
+        Returns:
+            [(属性名, 原始值), ...]，仅包含成功修改的属性
+        """
+        original = []
+        for name, value in _SUSPENDED_APP_SETTINGS:
+            try:
+                previous = getattr(excel, name)
+                setattr(excel, name, value)
+                original.append((name, previous))
+            except (com_error, AttributeError) as e:
+                log(f"Cannot set {name} on {self.app_name}: {e}")
+        return original
+    
+    def _restore_app_settings(self, excel, original: list) -> None:
+        """恢复 _suspend_app_settings 修改过的属性"""
+        for name, previous in original:
+            try:
+                setattr(excel, name, previous)
+            except (com_error, AttributeError) as e:
+                log(f"Failed to restore {name} on {self.app_name}: {e}")
+    
+    def _apply_formats(self, sheet, start_row: int, start_col: int, format_info: list) -> None:
+        """
+        应用单元格格式
+        
+        整个单元格统一的格式（换行、代码块、单片段的粗体/斜体/删除线/行内代码）
+        按属性分组，用多区域 Range 一次设置；其余单元格逐个处理
+        
+        Args:
+            sheet: 工作表对象
+            start_row: 起始行号
+            start_col: 起始列号
+            format_info: [(row, col, cell_format, clean_text), ...]
+        """
+        # 绑定到局部变量，避免循环中重复的动态属性查找
+        cells = sheet.Cells
+        sheet_range = sheet.Range
+        
+        groups = {name: [] for name in _GROUP_FORMATTERS}
+        per_cell = []
+        
+        for i, j, cell_format, clean_text in format_info:
+            row, col = start_row + i, start_col + j
+            addr = _cell_address(row, col)
+            
+            # 如果包含换行,启用单元格自动换行
+            if cell_format.has_newline:
+                groups["wrap"].append(addr)
+            
+            kind = cell_format.kind
+            if kind == KIND_CODE_BLOCK:
+                groups["code_block"].append(addr)
+                continue
+            
+            if kind == KIND_PLAIN:
+                # 除自动换行外没有需要设置的格式
+                continue
+            
+            if kind == KIND_SINGLE_STYLE:
+                # 单个片段覆盖整个单元格，格式可直接设在单元格上
+                segment = cell_format.segments[0]
+                if segment.bold:
+                    groups["bold"].append(addr)
+                if segment.italic:
+                    groups["italic"].append(addr)
+                if segment.strikethrough:
+                    groups["strikethrough"].append(addr)
+                if segment.is_code:
+                    groups["code"].append(addr)
+                continue
+            
+            per_cell.append((i, j, row, col, cell_format, clean_text))
+        
+        for name, addresses in groups.items():
+            if not addresses:
+                continue
+            formatter = _GROUP_FORMATTERS[name]
+            for address in _join_addresses(addresses):
+                try:
+                    formatter(sheet_range(address))
+                except com_error as e:
+                    # 多区域设置失败时退回逐个单元格设置
+                    log(f"Failed to apply {name} format to {address}: {e}")
+                    for single in address.split(","):
+                        try:
+                            formatter(sheet_range(single))
+                        except com_error as e:
+                            log(f"Failed to apply {name} format to {single}: {e}")
+        
+        if not per_cell:
+            return
+        
+        # 超链接集合的 Add 方法只解析一次
+        try:
+            add_hyperlink = sheet.Hyperlinks.Add
+        except com_error as e:
+            log(f"Failed to get Hyperlinks on {self.app_name}: {e}")
+            return
+        for i, j, row, col, cell_format, clean_text in per_cell:
+            try:
+                self._apply_rich_text(add_hyperlink, cells(row, col), cell_format, clean_text)
+            except com_error as e:
+                # 格式应用失败，记录但继续
+                log(f"Failed to apply format to cell ({i},{j}): {e}")
+    
+    def _apply_rich_text(self, add_hyperlink, cell, cell_format, clean_text: str) -> None:
+        """
+        为包含多个片段或超链接的单元格逐段设置格式（按解析时确定的格式类别分派）
+        
+        Args:
+            add_hyperlink: 工作表的 Hyperlinks.Add 方法
+            cell: 目标单元格
+            cell_format: 已解析的单元格格式
+            clean_text: 单元格纯文本
+        """
+        applier = _RICH_TEXT_APPLIERS.get(cell_format.kind)
+        if applier is not None:
+            applier(add_hyperlink, cell, cell_format, clean_text)
+    
     def _get_application(self):
         """
         获取 Excel 应用程序实例（尝试所有可能的 ProgID）
@@ -224,14 +481,16 @@ class BaseExcelInserter(BaseTableInserter):
         Raises:
             Exception: 无法获取实例时
         """
-        import win32com.client
-        
         # 尝试所有可能的 ProgID
-        for prog_id in self.prog_ids:
+        for prog_id in self._ordered_prog_ids():
             try:
                 # 尝试连接现有实例
                 excel = win32com.client.GetActiveObject(prog_id)
                 log(f"Successfully connected to {prog_id}")
+                self._last_prog_id = prog_id
+                if self.early_bind:
+                    # 早期绑定：已有生成的包装类时 DISPID 由其提供，不再每次属性访问都 GetIDsOfNames
+                    excel = early_bound(excel)
                 return excel
             except Exception as e:
                 log(f"Failed to connect to {prog_id}: {e}")
@@ -252,9 +511,8 @@ class BaseExcelInserter(BaseTableInserter):
         Returns:
             清除格式后的纯文本
         """
-        # 直接使用 CellFormat 来解析
-        cell_format = CellFormat(text)
-        return cell_format.parse()
+        # 纯文本直接返回，其余交给 CellFormat 解析
+        return strip_markdown(text)
 
     def _refalsh_app(self) -> object:
         """
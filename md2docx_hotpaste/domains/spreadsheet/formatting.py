@@ -1,11 +1,48 @@
 """Cell formatting utilities for spreadsheet insertion."""
 
+import bisect
+import functools
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+
+# 预编译的 HTML 标签正则（每个单元格都会用到，避免每次经过 re 模块的缓存查找）
+_BR_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_PRE_PATTERN = re.compile(r'<pre>(.*?)</pre>', re.DOTALL | re.IGNORECASE)
+_CODE_PATTERN = re.compile(r'<code>(.*?)</code>', re.DOTALL | re.IGNORECASE)
+
+
+# 会触发行内格式解析的字符（转义、代码、删除线、粗体/斜体、链接）
+_MARKUP_CHARS = frozenset('\\`~*_[')
+# 纯文本单元格不会包含的字符（格式标记 + HTML 标签起始符）
+_SPECIAL_CHARS = _MARKUP_CHARS | {'<'}
+# 需要设置单元格格式的字符（再加上会触发自动换行的换行符）
+_FORMAT_CHARS = _SPECIAL_CHARS | {'\n'}
+
+
+# 建立位置索引的分隔符（配对查找时使用）
+_DELIMITER_CHARS = frozenset('`~*_])')
+
+
+# 单元格格式类别（解析时确定，插入阶段按类别分派处理函数）
+KIND_PLAIN = 0          # 无格式（空单元格或只有无格式片段）
+KIND_SINGLE_STYLE = 1   # 单个片段、无超链接：格式可整格设置
+KIND_SINGLE_LINK = 2    # 单个超链接片段（无粗体/斜体/删除线）
+KIND_CODE_BLOCK = 3     # <pre>/<code> 代码块
+KIND_RICH = 4           # 多个片段、无超链接：逐段设置富文本
+KIND_RICH_LINK = 5      # 其余含超链接的单元格
+
+
+def _unwrap_code_tag(match: re.Match) -> str:
+    """提取 <pre>/<code> 标签内容，并将其中的 <br> 转换为换行"""
+    return _BR_PATTERN.sub('\n', match.group(1))
 
 
 class TextSegment:
     """文本片段,带有格式信息"""
+    # 每个单元格都会创建若干片段，使用 __slots__ 省去实例 __dict__
+    __slots__ = ('text', 'bold', 'italic', 'strikethrough', 'is_code', 'hyperlink_url')
+    
     def __init__(self, text: str, bold: bool = False, italic: bool = False,
                  strikethrough: bool = False, is_code: bool = False,
                  hyperlink_url: Optional[str] = None):
@@ -17,210 +54,352 @@ class TextSegment:
         self.hyperlink_url = hyperlink_url  # 如果非空,表示这是一个超链接
 
 
+class _DelimiterIndex:
+    """
+    文本中分隔符位置的索引
+    
+    一次遍历记录各分隔符出现的位置，之后查找“下一个配对分隔符”用二分查找完成，
+    不再在每一层嵌套中对剩余文本重复线性扫描
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._positions = {ch: [] for ch in _DELIMITER_CHARS}
+        for pos, ch in enumerate(text):
+            if ch in _DELIMITER_CHARS:
+                self._positions[ch].append(pos)
+        self._runs = {}
+        self._singles = {}
+    
+    def count(self, ch: str) -> int:
+        """ch 在全文中出现的次数"""
+        return len(self._positions[ch])
+    
+    def find(self, ch: str, start: int, end: int) -> int:
+        """查找 [start, end) 内第一个 ch 的位置，没有时返回 -1"""
+        positions = self._positions[ch]
+        k = bisect.bisect_left(positions, start)
+        if k < len(positions) and positions[k] < end:
+            return positions[k]
+        return -1
+    
+    def find_run(self, ch: str, length: int, start: int, end: int) -> int:
+        """查找 [start, end) 内第一个由 length 个 ch 组成的连续串（允许与更长的串重叠），没有时返回 -1"""
+        key = (ch, length)
+        runs = self._runs.get(key)
+        if runs is None:
+            text = self.text
+            tail = ch * (length - 1)
+            runs = self._runs[key] = [pos for pos in self._positions[ch] if text.startswith(tail, pos + 1)]
+        k = bisect.bisect_left(runs, start)
+        if k < len(runs) and runs[k] + length <= end:
+            return runs[k]
+        return -1
+    
+    def find_single(self, ch: str, start: int, end: int) -> int:
+        """
+        查找 [start, end) 内第一个后面不紧跟同一字符的 ch（区间末尾的 ch 总是满足），
+        没有时返回 -1
+        """
+        singles = self._singles.get(ch)
+        if singles is None:
+            text = self.text
+            size = len(text)
+            singles = self._singles[ch] = [
+                pos for pos in self._positions[ch] if pos + 1 >= size or text[pos + 1] != ch
+            ]
+        k = bisect.bisect_left(singles, start)
+        if k < len(singles) and singles[k] < end - 1:
+            return singles[k]
+        last = end - 1
+        if last >= start and self.text[last] == ch:
+            return last
+        return -1
+
+
 class CellFormat:
     """单元格格式信息"""
+    __slots__ = ('text', 'is_code_block', 'has_newline', 'segments', 'clean_text',
+                 'has_any_format', 'has_hyperlink', 'has_inline_code', 'is_single_plain', 'kind')
+    
     def __init__(self, text: str):
         self.text = text
         self.is_code_block = False
         self.has_newline = False
         self.segments = []  # List[TextSegment]
         self.clean_text = text
+        # 解析后一次性汇总的片段格式（插入阶段直接判断，不再反复遍历片段）
+        self.has_any_format = False  # 任一片段有粗体/斜体/删除线/代码/超链接
+        self.has_hyperlink = False
+        self.has_inline_code = False
+        self.is_single_plain = False  # 只有一个无格式片段
+        self.kind = KIND_PLAIN  # 格式类别，见 KIND_* 常量
     
     def parse(self) -> str:
-        """解析 Markdown 格式并生成文本片段(字符级解析)"""
+        """解析 Markdown 格式并生成文本片段(字符级解析，相同文本的解析结果会被缓存)"""
         text = self.text
         
-        # 处理 HTML 标签和换行
-        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+        # 纯文本单元格（最常见）：一次集合判断后直接返回，不做任何标签/格式处理
+        if _SPECIAL_CHARS.isdisjoint(text):
+            self.has_newline = '\n' in text
+            self.segments = [TextSegment(text)] if text else []
+            self.clean_text = text
+            self.is_single_plain = bool(text)
+            return text
+        
+        # 表格中常有重复的单元格文本，复用同一文本的解析结果
+        (self.is_code_block, self.has_newline, segments, self.clean_text,
+         self.has_any_format, self.has_hyperlink, self.has_inline_code, self.kind) = _parse_cached(text)
+        self.segments = list(segments)
+        self.is_single_plain = len(segments) == 1 and not self.has_any_format
+        return self.clean_text
+    
+    def _summarize_segments(self) -> None:
+        """遍历一次片段列表，汇总 has_any_format / has_hyperlink / has_inline_code"""
+        has_styled = has_hyperlink = has_inline_code = False
+        for seg in self.segments:
+            if seg.bold or seg.italic or seg.strikethrough:
+                has_styled = True
+            if seg.hyperlink_url:
+                has_hyperlink = True
+            if seg.is_code:
+                has_inline_code = True
+        self.has_any_format = has_styled or has_hyperlink or has_inline_code
+        self.has_hyperlink = has_hyperlink
+        self.has_inline_code = has_inline_code
+        
+        segments = self.segments
+        if self.is_code_block:
+            self.kind = KIND_CODE_BLOCK
+        elif not self.has_any_format and len(segments) <= 1:
+            self.kind = KIND_PLAIN
+        elif len(segments) == 1:
+            seg = segments[0]
+            if not has_hyperlink:
+                self.kind = KIND_SINGLE_STYLE
+            elif not (seg.bold or seg.italic or seg.strikethrough):
+                self.kind = KIND_SINGLE_LINK
+            else:
+                self.kind = KIND_RICH_LINK
+        else:
+            self.kind = KIND_RICH_LINK if has_hyperlink else KIND_RICH
+    
+    def _parse_uncached(self) -> str:
+        """解析含格式标记或 HTML 标签的文本（不经过缓存）"""
+        text = self.text
+        
+        # 处理 HTML 标签和换行（没有 '<' 时不可能有标签，跳过正则）
+        has_tag = '<' in text
+        if has_tag:
+            text = _BR_PATTERN.sub('\n', text)
         if '\n' in text:
             self.has_newline = True
         
         # 检查是否包含代码块标签
-        if '<pre>' in text.lower() or '<code>' in text.lower():
+        lowered = text.lower() if has_tag else ''
+        if '<pre>' in lowered or '<code>' in lowered:
             self.is_code_block = True
             # 提取代码块内容
-            text = re.sub(r'<pre>(.*?)</pre>',
-                          lambda m: re.sub(r'<br\s*/?>', '\n', m.group(1), flags=re.IGNORECASE),
-                          text, flags=re.DOTALL | re.IGNORECASE)
-            text = re.sub(r'<code>(.*?)</code>',
-                          lambda m: re.sub(r'<br\s*/?>', '\n', m.group(1), flags=re.IGNORECASE),
-                          text, flags=re.DOTALL | re.IGNORECASE)
+            text = _PRE_PATTERN.sub(_unwrap_code_tag, text)
+            text = _CODE_PATTERN.sub(_unwrap_code_tag, text)
             self.clean_text = text.strip()
             self.segments = [TextSegment(self.clean_text, is_code=True)]
             return self.clean_text
         
+        # 只有 <br> 等标签、没有格式标记的单元格同样作为单个片段
+        if _MARKUP_CHARS.isdisjoint(text):
+            self.segments = [TextSegment(text)] if text else []
+            self.clean_text = text
+            return text
+        
         # 解析为文本片段
-        self.segments = self._parse_segments(text)
-        self.clean_text = ''.join(seg.text for seg in self.segments)
+        self.segments, self.clean_text = self._parse_segments(text)
         return self.clean_text
     
-    def _parse_segments(self, text: str, bold: bool = False, italic: bool = False,
-                        strikethrough: bool = False) -> List[TextSegment]:
+    def _parse_segments(self, text: str) -> Tuple[List[TextSegment], str]:
         """
         解析文本为带格式的片段列表
         
+        用显式栈代替递归：每个栈帧对应 text 中的一个区间及其继承的格式，
+        嵌套结构（粗体、链接等）只记录区间下标，不再切片复制子串后重新扫描
+        
         Args:
             text: 要解析的文本
-            bold: 当前是否在粗体环境中
-            italic: 当前是否在斜体环境中
-            strikethrough: 当前是否在删除线环境中
+            
+        Returns:
+            (片段列表, 纯文本)；纯文本在生成片段时同步累积，不再二次遍历片段拼接
         """
         segments = []
-        i = 0
-        current_text = []
+        clean_parts = []
+        # 所有配对查找都走同一份位置索引
+        index = _DelimiterIndex(text)
         
-        def flush_current():
-            """将当前累积的文本保存为片段"""
-            if current_text:
-                text_str = ''.join(current_text)
-                if text_str:
-                    segments.append(TextSegment(text_str, bold, italic, strikethrough))
-                current_text.clear()
+        # 全文出现不足两次的分隔符不可能配对，直接当普通字符，不进入配对查找；
+        # 缺少 ]、( 或 ) 时同样不可能构成链接
+        markup_chars = {'\\'}
+        markup_chars.update(ch for ch in '`~*_' if index.count(ch) >= 2)
+        if index.count(']') and index.count(')') and '(' in text:
+            markup_chars.add('[')
+        find = index.find
+        find_run = index.find_run
         
-        while i < len(text):
-            # 处理转义字符
-            if text[i] == '\\' and i + 1 < len(text):
-                current_text.append(text[i + 1])
-                i += 2
-                continue
-            
-            # 检测行内代码 `...`
-            if text[i] == '`':
-                end = text.find('`', i + 1)
-                if end != -1:
-                    flush_current()
-                    # 代码块内的文本不做任何解析
-                    code_text = text[i + 1:end]
-                    segments.append(TextSegment(code_text, is_code=True))
-                    i = end + 1
-                    continue
-            
-            # 检测删除线 ~~...~~
-            if text[i:i + 2] == '~~' and not strikethrough:
-                end = text.find('~~', i + 2)
-                if end != -1:
-                    flush_current()
-                    inner = text[i + 2:end]
-                    # 递归解析,传递删除线状态
-                    segments.extend(self._parse_segments(inner, bold, italic, True))
-                    i = end + 2
-                    continue
-            
-            # 检测粗斜体 ***...*** (必须在 ** 之前检测)
-            if text[i:i + 3] == '***' and not bold and not italic:
-                end = text.find('***', i + 3)
-                if end != -1:
-                    flush_current()
-                    inner = text[i + 3:end]
-                    # 递归解析,同时传递粗体和斜体状态
-                    segments.extend(self._parse_segments(inner, True, True, strikethrough))
-                    i = end + 3
-                    continue
+        # 栈帧: [当前位置, 区间结束位置, 粗体, 斜体, 删除线, 超链接URL, 累积的普通字符]
+        stack = [[0, len(text), False, False, False, None, []]]
+        
+        while stack:
+            frame = stack[-1]
+            i, end, bold, italic, strikethrough, url, current_text = frame
+            # 遇到嵌套结构时记录: (内部起点, 内部终点, 外层恢复位置, 粗体, 斜体, 删除线, 超链接URL)
+            child = None
             
-            # 检测粗体 **...** 或 __...__
-            if text[i:i + 2] == '**' and not bold:
-                # 查找匹配的 **,需要跳过单个 *
-                end = i + 2
-                while end < len(text) - 1:
-                    if text[end:end + 2] == '**':
-                        flush_current()
-                        inner = text[i + 2:end]
-                        # 递归解析,传递粗体状态
-                        segments.extend(self._parse_segments(inner, True, italic, strikethrough))
-                        i = end + 2
-                        break
-                    end += 1
-                else:
-                    # 没找到配对的,当普通字符处理
-                    current_text.append(text[i])
+            while i < end:
+                ch = text[i]
+                
+                # 普通字符（绝大多数）一次集合判断后直接累积，跳过下面所有分支
+                if ch not in markup_chars:
+                    current_text.append(ch)
                     i += 1
-                continue
-            
-            # 检测粗斜体 ___...___ (必须在 __ 之前检测)
-            if text[i:i + 3] == '___' and not bold and not italic:
-                end = text.find('___', i + 3)
-                if end != -1:
-                    flush_current()
-                    inner = text[i + 3:end]
-                    # 递归解析,同时传递粗体和斜体状态
-                    segments.extend(self._parse_segments(inner, True, True, strikethrough))
-                    i = end + 3
                     continue
-            
-            if text[i:i + 2] == '__' and not bold:
-                # 查找匹配的 __,需要跳过单个 _
-                end = i + 2
-                while end < len(text) - 1:
-                    if text[end:end + 2] == '__':
-                        flush_current()
-                        inner = text[i + 2:end]
-                        segments.extend(self._parse_segments(inner, True, italic, strikethrough))
-                        i = end + 2
-                        break
-                    end += 1
-                else:
-                    # 没找到配对的,当普通字符处理
-                    current_text.append(text[i])
-                    i += 1
-                continue
-            
-            # 检测斜体 *...* 或 _..._ (移除 not italic 限制,允许在粗体内使用斜体)
-            if text[i] == '*' and (i + 1 >= len(text) or text[i + 1] != '*'):
-                end = i + 1
-                # 查找匹配的结束星号
-                while end < len(text):
-                    if text[end] == '*' and (end + 1 >= len(text) or text[end + 1] != '*'):
-                        flush_current()
-                        inner = text[i + 1:end]
-                        # 递归解析,传递斜体状态
-                        segments.extend(self._parse_segments(inner, bold, True, strikethrough))
-                        i = end + 1
-                        break
-                    end += 1
-                else:
-                    # 没找到配对的,当普通字符处理
-                    current_text.append(text[i])
-                    i += 1
-                continue
-            
-            if text[i] == '_' and (i + 1 >= len(text) or text[i + 1] != '_'):
-                end = i + 1
-                while end < len(text):
-                    if text[end] == '_' and (end + 1 >= len(text) or text[end + 1] != '_'):
-                        flush_current()
-                        inner = text[i + 1:end]
-                        segments.extend(self._parse_segments(inner, bold, True, strikethrough))
-                        i = end + 1
-                        break
-                    end += 1
-                else:
-                    # 没找到配对的,当普通字符处理
-                    current_text.append(text[i])
-                    i += 1
-                continue
-            
-            # 检测链接 [text](url)
-            if text[i] == '[':
-                close_bracket = text.find(']', i + 1)
-                if close_bracket != -1 and close_bracket + 1 < len(text) and text[close_bracket + 1] == '(':
-                    close_paren = text.find(')', close_bracket + 2)
-                    if close_paren != -1:
-                        flush_current()
-                        # 提取链接文本和URL
-                        link_text = text[i + 1:close_bracket]
-                        link_url = text[close_bracket + 2:close_paren]
-                        # 解析链接文本的格式,并添加超链接URL
-                        link_segments = self._parse_segments(link_text, bold, italic, strikethrough)
-                        # 为每个片段添加超链接URL
-                        for seg in link_segments:
-                            seg.hyperlink_url = link_url
-                        segments.extend(link_segments)
-                        i = close_paren + 1
+                
+                # 处理转义字符
+                if ch == '\\' and i + 1 < end:
+                    current_text.append(text[i + 1])
+                    i += 2
+                    continue
+                
+                # 检测行内代码 `...`
+                if ch == '`':
+                    close = find('`', i + 1, end)
+                    if close != -1:
+                        if current_text:
+                            piece = ''.join(current_text)
+                            segments.append(TextSegment(piece, bold, italic, strikethrough, hyperlink_url=url))
+                            clean_parts.append(piece)
+                            current_text.clear()
+                        # 代码块内的文本不做任何解析
+                        piece = text[i + 1:close]
+                        segments.append(TextSegment(piece, is_code=True, hyperlink_url=url))
+                        clean_parts.append(piece)
+                        i = close + 1
                         continue
+                
+                # 检测删除线 ~~...~~
+                elif ch == '~':
+                    if not strikethrough and i + 1 < end and text[i + 1] == '~':
+                        close = find_run('~', 2, i + 2, end)
+                        if close != -1:
+                            child = (i + 2, close, close + 2, bold, italic, True, url)
+                            break
+                
+                elif ch == '*' or ch == '_':
+                    # 直接比较后续字符，不构造 ch * 2 / ch * 3 再做前缀匹配
+                    doubled = i + 1 < end and text[i + 1] == ch
+                    
+                    # 检测粗斜体 ***...*** / ___...___ (必须在 ** / __ 之前检测)
+                    if not bold and not italic and doubled and i + 2 < end and text[i + 2] == ch:
+                        close = find_run(ch, 3, i + 3, end)
+                        if close != -1:
+                            child = (i + 3, close, close + 3, True, True, strikethrough, url)
+                            break
+                    
+                    # 检测粗体 **...** 或 __...__
+                    if not bold and doubled:
+                        close = find_run(ch, 2, i + 2, end)
+                        if close != -1:
+                            child = (i + 2, close, close + 2, True, italic, strikethrough, url)
+                            break
+                        # 没找到配对的,当普通字符处理
+                        current_text.append(ch)
+                        i += 1
+                        continue
+                    
+                    # 检测斜体 *...* 或 _..._ (允许在粗体内使用斜体)
+                    if not doubled:
+                        # 查找匹配的结束符（后面不能紧跟同一字符）
+                        close = index.find_single(ch, i + 1, end)
+                        if close != -1:
+                            child = (i + 1, close, close + 1, bold, True, strikethrough, url)
+                            break
+                        # 没找到配对的,当普通字符处理
+                        current_text.append(ch)
+                        i += 1
+                        continue
+                
+                # 检测链接 [text](url)
+                elif ch == '[':
+                    close_bracket = find(']', i + 1, end)
+                    if close_bracket != -1 and close_bracket + 1 < end and text[close_bracket + 1] == '(':
+                        close_paren = find(')', close_bracket + 2, end)
+                        if close_paren != -1:
+                            # 嵌套链接时以最外层链接的 URL 为准
+                            link_url = url if url is not None else text[close_bracket + 2:close_paren]
+                            child = (i + 1, close_bracket, close_paren + 1, bold, italic, strikethrough, link_url)
+                            break
+                
+                # 普通字符
+                current_text.append(ch)
+                i += 1
+            
+            # 将当前累积的文本保存为片段
+            if current_text:
+                piece = ''.join(current_text)
+                segments.append(TextSegment(piece, bold, italic, strikethrough, hyperlink_url=url))
+                clean_parts.append(piece)
+                current_text.clear()
             
-            # 普通字符
-            current_text.append(text[i])
-            i += 1
+            if child is None:
+                # 区间解析完毕，回到外层
+                stack.pop()
+            else:
+                inner_start, inner_end, resume, *formats = child
+                frame[0] = resume
+                stack.append([inner_start, inner_end, *formats, []])
+        
+        return segments, ''.join(clean_parts)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_cached(text: str) -> Tuple[bool, bool, Tuple[TextSegment, ...], str, bool, bool, bool, int]:
+    """
+    解析单元格文本并缓存结果
+    
+    缓存中的 TextSegment 会被多个单元格共享，调用方只能读取不能修改
+    
+    Returns:
+        (is_code_block, has_newline, segments, clean_text, has_any_format, has_hyperlink, has_inline_code, kind)
+    """
+    cell_format = CellFormat(text)
+    clean_text = cell_format._parse_uncached()
+    cell_format._summarize_segments()
+    return (cell_format.is_code_block, cell_format.has_newline, tuple(cell_format.segments), clean_text,
+            cell_format.has_any_format, cell_format.has_hyperlink, cell_format.has_inline_code, cell_format.kind)
+
+
+def is_plain_text(text: str) -> bool:
+    """
+    检查文本是否完全不需要格式处理（无格式标记、HTML 标签和换行）
+    
+    Args:
+        text: 单元格文本
+        
+    Returns:
+        True 如果文本可以原样写入单元格
+    """
+    return _FORMAT_CHARS.isdisjoint(text)
+
+
+def strip_markdown(text: str) -> str:
+    """
+    清除 Markdown 格式符号，返回纯文本
+    
+    不含任何格式标记或 HTML 标签的文本直接原样返回；其余文本直接取缓存的解析结果中的纯文本，
+    不创建 CellFormat，也不复制片段列表
+    
+    Args:
+        text: 包含 Markdown 格式的文本
         
-        flush_current()
-        return segments
+    Returns:
+        清除格式后的纯文本
+    """
+    if _SPECIAL_CHARS.isdisjoint(text):
+        return text
+    return _parse_cached(text)[3]
@@ -9,7 +9,7 @@ from openpyxl.cell.rich_text import TextBlock, CellRichText
 
 from ...utils.logging import log
 from ...core.errors import InsertError
-from .formatting import CellFormat
+from .formatting import CellFormat, strip_markdown
 
 
 class SpreadsheetGenerator:
@@ -56,7 +56,7 @@ class SpreadsheetGenerator:
                         
                         # 检查是否有超链接
                         hyperlink_url = None
-                        if cell_format.segments:
+                        if cell_format.has_hyperlink:
                             # 查找第一个超链接
                             for seg in cell_format.segments:
                                 if seg.hyperlink_url:
@@ -133,8 +133,7 @@ class SpreadsheetGenerator:
                             cell.value = clean_text
                     else:
                         # 不保留格式，清除 Markdown 符号
-                        cell_format = CellFormat(cell_value)
-                        cell.value = cell_format.parse()
+                        cell.value = strip_markdown(cell_value)
                     
                     # 第一行应用表头样式
                     if row_idx == 1:
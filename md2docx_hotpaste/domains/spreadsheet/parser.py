@@ -4,6 +4,15 @@ import re
 from typing import List, Optional
 
 
+# 表格分隔符行（如 |---|:---:|）
+_SEPARATOR_PATTERN = re.compile(r'^\s*\|?\s*[-:]+\s*(\|\s*[-:]+\s*)+\|?\s*$')
+# 分隔符行只可能包含的字符（先用集合判断，通过后才跑正则）
+_SEPARATOR_CHARS = frozenset('|-: \t')
+# 分割单元格时转义竖线 \| 的占位符（Markdown 文本中不会出现；万一出现则改用私用区字符）
+_ESCAPED_PIPE = '\x00'
+_ESCAPED_PIPE_FALLBACK = '\ue000'
+
+
 def _split_table_cells(line: str) -> List[str]:
     """
     按 | 分割表格单元格,正确处理转义的竖线
@@ -14,29 +23,17 @@ def _split_table_cells(line: str) -> List[str]:
     Returns:
         单元格列表
     """
-    cells = []
-    current_cell = []
-    i = 0
+    if not line:
+        return []
     
-    while i < len(line):
-        if i > 0 and line[i] == '|' and line[i - 1] == '\\':
-            # 转义的竖线,替换前一个反斜杠并添加竖线
-            current_cell[-1] = '|'
-            i += 1
-        elif line[i] == '|':
-            # 未转义的竖线,分割单元格
-            cells.append(''.join(current_cell).strip())
-            current_cell = []
-            i += 1
-        else:
-            current_cell.append(line[i])
-            i += 1
+    # 没有转义竖线时直接按 | 分割（str.split 在 C 层完成，不逐字符循环）
+    if '\\|' not in line:
+        return [cell.strip() for cell in line.split('|')]
     
-    # 添加最后一个单元格
-    if current_cell or cells:  # 如果有内容或已经有单元格
-        cells.append(''.join(current_cell).strip())
-    
-    return cells
+    # 转义的竖线先替换为占位符，分割后再还原为竖线
+    placeholder = _ESCAPED_PIPE if _ESCAPED_PIPE not in line else _ESCAPED_PIPE_FALLBACK
+    parts = line.replace('\\|', placeholder).split('|')
+    return [cell.replace(placeholder, '|').strip() for cell in parts]
 
 
 def parse_markdown_table(md_text: str) -> Optional[List[List[str]]]:
@@ -49,10 +46,13 @@ def parse_markdown_table(md_text: str) -> Optional[List[List[str]]]:
     Returns:
         二维数组，每个元素代表一行的单元格内容；如果不是表格则返回 None
     """
-    lines = md_text.strip().split('\n')
-    if len(lines) < 2:
+    # 快速排除：没有竖线或只有一行的内容不可能是表格（普通文本粘贴的常见情况）
+    md_text = md_text.strip()
+    if '|' not in md_text or '\n' not in md_text:
         return None
     
+    lines = md_text.split('\n')
+    
     table_data = []
     separator_found = False
     
@@ -63,8 +63,8 @@ def parse_markdown_table(md_text: str) -> Optional[List[List[str]]]:
         if not line:
             continue
             
-        # 检查是否为表格行（以 | 开头或结尾）
-        if not (line.startswith('|') or line.endswith('|') or '|' in line):
+        # 检查是否为表格行（包含 |；以 | 开头或结尾的情况已被包含在内）
+        if '|' not in line:
             # 如果已经找到分隔符，说明表格结束
             if separator_found:
                 break
@@ -72,7 +72,7 @@ def parse_markdown_table(md_text: str) -> Optional[List[List[str]]]:
             return None
         
         # 检查是否为分隔符行（如 |---|---|）
-        if re.match(r'^\s*\|?\s*[-:]+\s*(\|\s*[-:]+\s*)+\|?\s*$', line):
+        if _SEPARATOR_CHARS.issuperset(line) and _SEPARATOR_PATTERN.match(line):
             separator_found = True
             continue
         
@@ -8,6 +8,9 @@ from ...core.errors import InsertError
 class WPSExcelInserter(BaseExcelInserter):
     """WPS 表格插入器"""
     
+    # WPS 的类型库与 Excel 不完全一致，保持动态调度
+    early_bind = False
+    
     def __init__(self):
         super().__init__(prog_id=["ket.Application", "et.Application"], app_name="WPS 表格")
     
@@ -1,19 +1,283 @@
 """Pandoc CLI tool integration."""
 
+import atexit
+import base64
+import json
 import os
+import socket
 import subprocess
 import tempfile
+import threading
+import urllib.error
+import urllib.request
 from typing import Optional
 
+from ..core.constants import PANDOC_SERVER_TIMEOUT
 from ..core.errors import PandocError
 from ..utils.logging import log
 
 
+# 完整 Pandoc Markdown 读取器（默认；支持 raw TeX / 内联 HTML，但解析开销最大）
+_MARKDOWN_READER = "markdown+tex_math_dollars+raw_tex"
+# 可选的轻量读取器（commonmark_x 已内置 pipe_tables），需在配置中开启 commonmark_reader。
+# 它遵循 CommonMark 语义，与 Pandoc markdown 的输出并不完全相同：
+# 例如段落后未空行的缩进代码会并入段落，^上标^/~下标~、行块、简单/多行/网格表格等 Pandoc 专有语法会丢失或解析不同
+_COMMONMARK_READER = "commonmark_x+tex_math_dollars"
+
+
+def _select_reader(md_text: str, allow_commonmark: bool) -> str:
+    """
+    选择 Pandoc 输入格式：默认使用完整 Markdown 读取器，
+    仅在开启 commonmark_reader 且内容不含 \\begin 环境或 HTML 标签时使用 commonmark_x
+
+    Args:
+        md_text: Markdown 内容
+        allow_commonmark: 是否允许使用 commonmark_x 读取器
+
+    Returns:
+        Pandoc --from 参数
+    """
+    if not allow_commonmark or "\\begin" in md_text or "<" in md_text:
+        return _MARKDOWN_READER
+    return _COMMONMARK_READER
+
+
+# 引用图片等外部资源的标记：pandoc server 运行在沙箱中，无法读取本地文件或下载 URL，
+# 会静默丢弃这些资源，因此这类内容一律交给子进程转换
+_RESOURCE_MARKERS = ("![", "<img", "\\includegraphics")
+
+
+def _has_resource_reference(md_text: str) -> bool:
+    """
+    检查 Markdown 是否引用了图片等外部资源
+
+    Args:
+        md_text: Markdown 文本
+
+    Returns:
+        True 如果包含图片或资源引用
+    """
+    return any(marker in md_text for marker in _RESOURCE_MARKERS)
+
+
+def _find_free_port() -> int:
+    """向系统申请一个当前空闲的本地端口"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _PandocServer:
+    """
+    常驻的 `pandoc server` 进程：每次转换通过本机 HTTP 请求完成，
+    省去每次粘贴都要承担的进程创建和 Haskell 运行时初始化开销
+    """
+    
+    def __init__(self, pandoc_path: str, startupinfo, creationflags: int):
+        self._pandoc_path = pandoc_path
+        self._startupinfo = startupinfo
+        self._creationflags = creationflags
+        self._proc = None
+        self._url = None
+        self._failed = False  # 无法启动或已退出（如 Pandoc 版本不支持 server），不再尝试
+        # 多个粘贴线程共享同一服务：启动、重启判断和转换请求都在锁内进行（可重入，供 _disable 调用 stop）
+        self._lock = threading.RLock()
+        # 本机请求不走系统代理
+        self._opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    
+    def start(self) -> bool:
+        """
+        启动服务进程（已启动时直接返回）
+        
+        Returns:
+            True 如果服务进程正在运行
+        """
+        with self._lock:
+            if self._failed:
+                return False
+            if self._proc is not None:
+                if self._proc.poll() is None:
+                    return True
+                log(f"Pandoc server exited with code {self._proc.returncode}, falling back to subprocess")
+                self._failed = True
+                return False
+            
+            try:
+                port = _find_free_port()
+                self._proc = subprocess.Popen(
+                    [self._pandoc_path, "server", "--port", str(port), "--timeout", str(PANDOC_SERVER_TIMEOUT)],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    shell=False,
+                    startupinfo=self._startupinfo,
+                    creationflags=self._creationflags,
+                )
+            except (OSError, ValueError) as e:
+                log(f"Cannot start pandoc server: {e}")
+                self._failed = True
+                return False
+            
+            self._url = f"http://127.0.0.1:{port}/"
+            atexit.register(self.stop)
+            log(f"Started pandoc server on port {port}")
+            return True
+    
+    def _disable(self) -> None:
+        """服务接口与预期不符：结束进程，之后一律使用子进程"""
+        with self._lock:
+            self._failed = True
+            self.stop()
+    
+    def stop(self) -> None:
+        """结束服务进程"""
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.terminate()
+            proc.wait(timeout=2)
+        except Exception as e:
+            log(f"Failed to stop pandoc server: {e}")
+    
+    def convert(self, md_text: str, reader: str) -> Optional[bytes]:
+        """
+        通过服务将 Markdown 转换为 DOCX
+        
+        Args:
+            md_text: Markdown 文本
+            reader: Pandoc --from 参数
+            
+        Returns:
+            DOCX 字节；服务不可用（未启动完成、已退出或转换失败）或转换产生警告时返回 None，由调用方改用子进程
+        """
+        with self._lock:
+            if not self.start():
+                return None
+            return self._request(md_text, reader)
+    
+    def _request(self, md_text: str, reader: str) -> Optional[bytes]:
+        """发送一次转换请求并解析响应（调用方已持有锁）"""
+        payload = {"text": md_text, "from": reader, "to": "docx", "highlight-style": "tango"}
+        request = urllib.request.Request(
+            self._url,
+            # 中文等非 ASCII 字符按 UTF-8 原样发送，不展开为 \uXXXX 转义
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"},
+        )
+        try:
+            with self._opener.open(request, timeout=PANDOC_SERVER_TIMEOUT) as response:
+                result = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # 转换失败时交给子进程重新转换，由它给出与以往一致的错误信息；
+            # 非 500 的状态码说明服务接口与预期不符，之后不再使用服务
+            log(f"Pandoc server returned HTTP {e.code}: {e.read().decode('utf-8', 'ignore')}")
+            if e.code != 500:
+                self._disable()
+            return None
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            # 连接失败（服务尚未就绪或已退出）或响应不完整：本次退回子进程
+            log(f"Pandoc server unavailable, using subprocess: {e}")
+            return None
+        
+        output = result.get("output") if isinstance(result, dict) else None
+        if output is None:
+            log(f"Unexpected pandoc server response, disabling server: {str(result)[:200]}")
+            self._disable()
+            return None
+        
+        # 服务返回 200 时也可能丢弃了内容（如沙箱内无法读取的资源），有警告或错误就改用子进程
+        messages = result.get("messages") or []
+        if messages:
+            log(f"Pandoc server reported {len(messages)} message(s), using subprocess: {str(messages)[:200]}")
+            return None
+        
+        if not result.get("base64"):
+            return output.encode("utf-8")
+        # 二进制格式（docx）的输出以 base64 编码返回
+        try:
+            return base64.b64decode(output)
+        except ValueError as e:
+            log(f"Invalid base64 output from pandoc server: {e}")
+            return None
+
+
 class PandocIntegration:
     """Pandoc 工具集成"""
     
-    def __init__(self, pandoc_path: str = "pandoc"):
+    def __init__(
+        self,
+        pandoc_path: str = "pandoc",
+        use_server: bool = True,
+        use_tempfiles: bool = True,
+        use_commonmark: bool = False
+    ):
         self.pandoc_path = pandoc_path
+        # 是否允许对不含 raw TeX / HTML 的内容改用 commonmark_x 读取器（输出可能与 Pandoc markdown 不同）
+        self.use_commonmark = use_commonmark
+        # 输出到文件时，pandoc 的 stdout/stderr 只有诊断信息，写入临时文件而不是管道
+        self.use_tempfiles = use_tempfiles
+        # 与输入内容无关的固定参数，只构建一次
+        self._docx_args = ["--to", "docx", "--highlight-style", "tango"]
+
+        # 在 Windows 上隐藏控制台窗口
+        self._startupinfo = None
+        self._creationflags = 0
+        if os.name == "nt":
+            self._startupinfo = subprocess.STARTUPINFO()
+            self._startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            self._creationflags = subprocess.CREATE_NO_WINDOW
+        
+        # 常驻服务：现在就启动，让进程初始化与首次粘贴前的其他工作并行
+        self._server = None
+        if use_server:
+            self._server = _PandocServer(pandoc_path, self._startupinfo, self._creationflags)
+            self._server.start()
+
+    def _build_cmd(self, md_text: str, output_path: str, reference_docx: Optional[str]) -> list:
+        """构建 Pandoc 命令（固定部分复用 __init__ 中的模板）"""
+        cmd = [self.pandoc_path, "--from", _select_reader(md_text, self.use_commonmark), *self._docx_args, "-o", output_path]
+        if reference_docx:
+            cmd += ["--reference-doc", reference_docx]
+        return cmd
+    
+    def _convert_via_server(self, md_text: str, reference_docx: Optional[str]) -> Optional[bytes]:
+        """
+        尝试通过常驻服务转换
+        
+        服务运行在沙箱中不读取本地文件或 URL，使用参考模板或引用图片等资源时直接走子进程
+        
+        Returns:
+            DOCX 字节；未转换时返回 None
+        """
+        if self._server is None or reference_docx or _has_resource_reference(md_text):
+            return None
+        return self._server.convert(md_text, _select_reader(md_text, self.use_commonmark))
+    
+    def _run_with_tempfiles(self, cmd: list, md_bytes: bytes) -> tuple:
+        """
+        运行 pandoc，stdout/stderr 直接写入临时文件（真实文件描述符，不经过管道读取循环）
+        
+        Returns:
+            (returncode, stdout, stderr)，输出为字节
+        """
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            result = subprocess.run(
+                cmd,
+                input=md_bytes,
+                stdout=out,
+                stderr=err,
+                shell=False,
+                startupinfo=self._startupinfo,
+                creationflags=self._creationflags,
+            )
+            # 只有失败时才需要读回输出
+            if result.returncode == 0:
+                return 0, b"", b""
+            out.seek(0)
+            err.seek(0)
+            return result.returncode, out.read(), err.read()
     
     def convert_to_docx(
         self,
@@ -33,39 +297,32 @@ class PandocIntegration:
             PandocError: 转换失败时
         """
 
-        # 构建 Pandoc 命令
-        cmd = [
-            self.pandoc_path,
-            "--from", "markdown+tex_math_dollars+raw_tex",
-            "--to", "docx",
-            "-o", output_path,
-            "--highlight-style", "tango"
-        ]
-
-        if reference_docx:
-            cmd.extend(["--reference-doc", reference_docx])
-
         try:
-            # 在 Windows 上隐藏控制台窗口
-            startupinfo = None
-            creationflags = 0
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
+            docx_bytes = self._convert_via_server(md_text, reference_docx)
+            if docx_bytes is not None:
+                with open(output_path, "wb") as f:
+                    f.write(docx_bytes)
+                return
+            
+            md_bytes = md_text.encode("utf-8")
+            cmd = self._build_cmd(md_text, output_path, reference_docx)
 
-            result = subprocess.run(
-                cmd,
-                input=md_text.encode("utf-8"),
-                capture_output=True,
-                text=False,
-                shell=False,
-                startupinfo=startupinfo,
-                creationflags=creationflags,
-            )
+            if self.use_tempfiles:
+                returncode, stdout, stderr = self._run_with_tempfiles(cmd, md_bytes)
+            else:
+                result = subprocess.run(
+                    cmd,
+                    input=md_bytes,
+                    capture_output=True,
+                    text=False,
+                    shell=False,
+                    startupinfo=self._startupinfo,
+                    creationflags=self._creationflags,
+                )
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
 
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or result.stdout or "Pandoc conversion failed"
+            if returncode != 0:
+                error_msg = stderr.strip() or stdout or "Pandoc conversion failed"
                 log(f"Pandoc error: {error_msg}")
                 raise PandocError(error_msg)
 
@@ -78,33 +335,27 @@ class PandocIntegration:
     def convert_to_docx_bytes(self, md_text: str, reference_docx: Optional[str] = None) -> bytes:
         """
         用 stdin 喂入 Markdown，直接把 DOCX 从 stdout 读到内存（无任何输入文件写盘）
-        """
-        cmd = [
-            self.pandoc_path,
-            "-f", "markdown+tex_math_dollars+raw_tex",
-            "-t", "docx",
-            "-o", "-",
-            "--highlight-style", "tango",
-        ]
-        if reference_docx:
-            cmd += ["--reference-doc", reference_docx]
 
-        startupinfo = None
-        creationflags = 0
-        if os.name == "nt":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            creationflags = subprocess.CREATE_NO_WINDOW
+        Args:
+            md_text: Markdown 文本；服务直接发送文本，只有走子进程时才编码一次
+            reference_docx: 可选的参考文档模板路径
+        """
+        docx_bytes = self._convert_via_server(md_text, reference_docx)
+        if docx_bytes is not None:
+            return docx_bytes
+        
+        md_bytes = md_text.encode("utf-8")
+        cmd = self._build_cmd(md_text, "-", reference_docx)
 
         # 关键：input 直接传 UTF-8 字节；text=False 以得到二进制 stdout
         result = subprocess.run(
             cmd,
-            input=md_text.encode("utf-8"),
+            input=md_bytes,
             capture_output=True,
             text=False,
             shell=False,
-            startupinfo=startupinfo,
-            creationflags=creationflags,
+            startupinfo=self._startupinfo,
+            creationflags=self._creationflags,
         )
         if result.returncode != 0:
             # stderr 可能是字节，转成字符串便于日志查看
@@ -1,13 +1,118 @@
 """Hotkey configuration dialog."""
 
+import functools
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional, Callable
-from pynput import keyboard
 
 from ...utils.logging import log
 
 
+# UI 队列轮询间隔（毫秒）
+_UI_POLL_MS = 100
+
+# 所有对话框都在同一个固定的 UI 线程中运行：隐藏根窗口（Tcl 解释器）只在该线程中创建和使用，
+# 进程内只初始化一次，也不会在其他线程中被回收
+_ui_lock = threading.Lock()
+_ui_thread: Optional[threading.Thread] = None
+_ui_root: Optional[tk.Tk] = None
+_ui_tasks: "queue.Queue[Callable[[tk.Tk], None]]" = queue.Queue()
+
+
+def _ui_loop(ready: threading.Event, errors: list) -> None:
+    """UI 线程主体：创建隐藏根窗口，轮询任务队列并运行事件循环"""
+    global _ui_root
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        errors.append(e)
+        ready.set()
+        return
+    _ui_root = root
+    ready.set()
+    
+    def poll():
+        while True:
+            try:
+                task = _ui_tasks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                task(root)
+            except Exception as e:
+                log(f"UI task failed: {e}")
+        root.after(_UI_POLL_MS, poll)
+    
+    root.after(0, poll)
+    root.mainloop()
+
+
+def _run_on_ui_thread(task: Callable[[tk.Tk], None]) -> None:
+    """
+    在固定的 UI 线程中执行任务（必要时先启动该线程）
+    
+    Args:
+        task: 接收隐藏根窗口的回调；已在 UI 线程中时直接同步执行
+        
+    Raises:
+        tk.TclError: 无法初始化 Tk 时
+    """
+    global _ui_thread
+    with _ui_lock:
+        if _ui_thread is None or not _ui_thread.is_alive():
+            ready = threading.Event()
+            errors: list = []
+            thread = threading.Thread(target=_ui_loop, args=(ready, errors), name="TkUI", daemon=True)
+            thread.start()
+            ready.wait()
+            if errors:
+                raise errors[0]
+            _ui_thread = thread
+    
+    if threading.current_thread() is _ui_thread:
+        task(_ui_root)
+    else:
+        _ui_tasks.put(task)
+
+
+# 去除热键字符串中尖括号的转换表
+_STRIP_BRACKETS = str.maketrans({"<": None, ">": None})
+
+
+@functools.lru_cache(maxsize=32)
+def _format_hotkey_cached(hotkey: str) -> str:
+    """格式化热键显示（结果缓存，同一会话中热键字符串很少）"""
+    return hotkey.translate(_STRIP_BRACKETS).replace("+", " + ").title()
+
+
+# 修饰键及其在热键字符串中的顺序
+_MODIFIER_ORDER = ("ctrl", "shift", "alt", "cmd")
+_MODIFIER_SET = frozenset(_MODIFIER_ORDER)
+
+# Tk keysym -> pynput 键名（修饰键与特殊键），导入时构建一次
+_KEYSYM_TO_NAME = {
+    "Control_L": "ctrl", "Control_R": "ctrl",
+    "Shift_L": "shift", "Shift_R": "shift",
+    "Alt_L": "alt", "Alt_R": "alt",
+    "Win_L": "cmd", "Win_R": "cmd", "Super_L": "cmd", "Super_R": "cmd",
+    "Return": "enter",
+    "Escape": "esc",
+    "Prior": "page_up",
+    "Next": "page_down",
+    "Print": "print_screen",
+    "App": "menu",
+}
+# keysym 小写后即为 pynput 键名的特殊键
+for _keysym in ("space", "Tab", "BackSpace", "Delete", "Insert", "Home", "End",
+                "Up", "Down", "Left", "Right", "Pause", "Caps_Lock", "Scroll_Lock", "Num_Lock",
+                *(f"F{i}" for i in range(1, 21))):
+    _KEYSYM_TO_NAME[_keysym] = _keysym.lower()
+del _keysym
+
+
 class HotkeyDialog:
     """热键设置对话框"""
     
@@ -25,9 +130,22 @@ class HotkeyDialog:
         self.recording = False
         self.pressed_keys = set()
         self.released_keys = set()  # 新增：记录已释放的键
-        self.all_pressed_keys = set()  # 新增：记录所有按下过的键
-        
-        self.root = tk.Tk()
+        # 录制期间按下过的键，按修饰键 / 普通键分开记录
+        self._modifiers_pressed = set()
+        self._normal_pressed = set()
+        # 排序后的（修饰键, 普通键）划分结果，按键集合变化时失效
+        self._partition_cache = ((), ())
+        self._partition_dirty = True
+        self._pending_releases = 0  # 已按下但尚未释放的键数量
+        self._display_job: Optional[str] = None  # 已排队的显示刷新任务
+        
+        # 是否已绑定按键事件（仅录制期间绑定，只在对话框获得焦点时接收按键）
+        self._keys_bound = False
+        self.root: Optional[tk.Toplevel] = None  # 在 UI 线程中由 _build 创建
+    
+    def _build(self, hidden_root: tk.Tk):
+        """在 UI 线程中创建对话框窗口和组件"""
+        self.root = tk.Toplevel(hidden_root)
         self.root.title("设置热键")
         self.root.geometry("450x300")
         self.root.resizable(False, False)
@@ -40,9 +158,6 @@ class HotkeyDialog:
         
         # 创建UI组件
         self._create_widgets()
-        
-        # 键盘监听器
-        self.listener: Optional[keyboard.Listener] = None
     
     def _center_window(self):
         """将窗口居中显示"""
@@ -127,7 +242,7 @@ class HotkeyDialog:
     
     def _format_hotkey(self, hotkey: str) -> str:
         """格式化热键显示"""
-        return hotkey.replace("<", "").replace(">", "").replace("+", " + ").title()
+        return _format_hotkey_cached(hotkey)
     
     def _start_recording(self):
         """开始录制热键"""
@@ -137,7 +252,10 @@ class HotkeyDialog:
         self.recording = True
         self.pressed_keys.clear()
         self.released_keys.clear()
-        self.all_pressed_keys.clear()
+        self._modifiers_pressed.clear()
+        self._normal_pressed.clear()
+        self._partition_dirty = True
+        self._pending_releases = 0
         self.new_hotkey = None
         
         self.record_btn.config(text="正在录制... (按下组合键)", state=tk.DISABLED)
@@ -146,118 +264,150 @@ class HotkeyDialog:
         self.hotkey_entry.insert(0, "等待按键...")
         self.hotkey_entry.config(state="readonly")
         
-        # 启动键盘监听
-        self.listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release
-        )
-        self.listener.start()
+        # 绑定按键事件（Tk 事件只在对话框有焦点时触发，无需全局键盘钩子）
+        # 先解除可能残留的旧绑定，保证同一时刻只有一组处理函数
+        self._unbind_keys()
+        self._bind_keys()
+    
+    def _bind_keys(self):
+        """绑定对话框的按键事件"""
+        if self._keys_bound:
+            return
+        self.root.bind("<KeyPress>", self._on_key_press)
+        self.root.bind("<KeyRelease>", self._on_key_release)
+        self._keys_bound = True
+    
+    def _unbind_keys(self):
+        """解除对话框的按键事件绑定"""
+        if not self._keys_bound:
+            return
+        self._keys_bound = False
+        try:
+            self.root.unbind("<KeyPress>")
+            self.root.unbind("<KeyRelease>")
+        except tk.TclError:
+            # 窗口已销毁
+            pass
     
-    def _on_key_press(self, key):
+    def _on_key_press(self, event):
         """按键按下事件"""
-        if not self.recording:
+        # 绑定已解除后 Tk 不会再派发事件，这里只防御已排队的残留事件
+        if not self._keys_bound:
             return
         
         try:
             # 记录按下的键
-            key_name = self._get_key_name(key)
-            if key_name:
+            key_name = self._get_key_name(event)
+            if key_name and not self._was_pressed(key_name):
                 self.pressed_keys.add(key_name)
-                self.all_pressed_keys.add(key_name)  # 记录到总集合
+                # 按下时即完成修饰键 / 普通键的划分
+                (self._modifiers_pressed if key_name in _MODIFIER_SET else self._normal_pressed).add(key_name)
+                self._partition_dirty = True
+                self._pending_releases += 1
                 self._update_hotkey_display()
         except Exception as e:
             log(f"Error in key press handler: {e}")
+        
+        # 阻止 Tab / 空格等按键触发默认的焦点切换或按钮动作
+        return "break"
     
-    def _on_key_release(self, key):
+    def _on_key_release(self, event):
         """按键释放事件"""
-        if not self.recording:
-            return False
+        # 绑定已解除后 Tk 不会再派发事件，这里只防御已排队的残留事件
+        if not self._keys_bound:
+            return
         
         try:
-            key_name = self._get_key_name(key)
-            if key_name:
+            key_name = self._get_key_name(event)
+            # 只统计录制期间按下过、且首次释放的键（忽略长按重复和录制前按下的键）
+            if key_name and self._was_pressed(key_name) and key_name not in self.released_keys:
                 self.released_keys.add(key_name)
                 # 从当前按下的键中移除
                 self.pressed_keys.discard(key_name)
+                self._pending_releases -= 1
                 
                 # 检查是否所有按下过的键都已释放
-                if self.all_pressed_keys and self.all_pressed_keys == self.released_keys:
+                if self._pending_releases == 0:
                     # 所有键都释放了，完成录制
+                    self._unbind_keys()
                     self.root.after(100, self._finish_recording)
-                    return False  # 停止监听
         except Exception as e:
             log(f"Error in key release handler: {e}")
         
-        return True  # 继续监听
+        return "break"
     
-    def _get_key_name(self, key) -> Optional[str]:
-        """获取键名称"""
+    def _get_key_name(self, event) -> Optional[str]:
+        """获取键名称（将 Tk 按键事件转换为 pynput 热键格式的键名）"""
         try:
-            # 修饰键
-            if key in [keyboard.Key.ctrl, keyboard.Key.ctrl_l, keyboard.Key.ctrl_r]:
-                return "ctrl"
-            elif key in [keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r]:
-                return "shift"
-            elif key in [keyboard.Key.alt, keyboard.Key.alt_l, keyboard.Key.alt_r]:
-                return "alt"
-            elif key == keyboard.Key.cmd:
-                return "cmd"
-            
-            # 尝试获取键的名称（适用于特殊键）
-            if hasattr(key, 'name'):
-                return key.name.lower()
+            # 修饰键与特殊键（功能键、方向键等）：单次字典查找
+            name = _KEYSYM_TO_NAME.get(event.keysym)
+            if name:
+                return name
             
-            # 普通键：优先使用 vk (虚拟键码)
-            # 这样可以避免组合键时获取到控制字符
-            if hasattr(key, 'vk'):
-                # 将虚拟键码转换为字符
-                vk = key.vk
-                # A-Z: 65-90
-                if 65 <= vk <= 90:
-                    return chr(vk).lower()
-                # 0-9: 48-57
-                elif 48 <= vk <= 57:
-                    return chr(vk)
-                # 数字键盘 0-9: 96-105
-                elif 96 <= vk <= 105:
-                    return f"num{vk - 96}"
+            # 普通键：Windows 上 keycode 即虚拟键码
+            # 这样可以避免组合键时获取到控制字符或 Shift 后的符号
+            vk = event.keycode
+            # A-Z: 65-90（最常见，优先判断），转为小写字母
+            if 65 <= vk <= 90:
+                return chr(vk + 32)
+            # 0-9: 48-57
+            if 48 <= vk <= 57:
+                return chr(vk)
+            # 数字键盘 0-9: 96-105
+            if 96 <= vk <= 105:
+                return f"num{vk - 96}"
             
             # 最后尝试使用 char（仅当不是控制字符时）
-            if hasattr(key, 'char') and key.char:
+            if event.char:
                 # 过滤控制字符（ASCII < 32）
-                if ord(key.char) >= 32:
-                    return key.char.lower()
+                if ord(event.char[0]) >= 32:
+                    return event.char.lower()
             
             return None
         except Exception as e:
             log(f"Error getting key name: {e}")
             return None
     
+    def _was_pressed(self, key_name: str) -> bool:
+        """检查录制期间是否按下过该键"""
+        return key_name in self._modifiers_pressed or key_name in self._normal_pressed
+    
+    def _compute_partition(self) -> tuple:
+        """
+        获取排序后的按键划分（缓存到按键集合下次变化为止）
+        
+        Returns:
+            (修饰键列表, 普通键列表)，修饰键按固定顺序，普通键按字母顺序
+        """
+        if self._partition_dirty:
+            self._partition_cache = (
+                [m for m in _MODIFIER_ORDER if m in self._modifiers_pressed],
+                sorted(self._normal_pressed),
+            )
+            self._partition_dirty = False
+        return self._partition_cache
+    
     def _update_hotkey_display(self):
-        """更新热键显示"""
-        if not self.all_pressed_keys:
+        """请求更新热键显示（合并短时间内的连续按键，只重绘一次）"""
+        if self._display_job is not None:
+            return
+        self._display_job = self.root.after(30, self._flush_display)
+    
+    def _flush_display(self):
+        """按当前按键集合刷新热键显示"""
+        self._display_job = None
+        if not self._modifiers_pressed and not self._normal_pressed:
             return
         
         # 排序：修饰键在前，普通键在后
-        modifiers = []
-        keys = []
-        
-        modifier_order = ['ctrl', 'shift', 'alt', 'cmd']
-        for mod in modifier_order:
-            if mod in self.all_pressed_keys:
-                modifiers.append(mod)
-        
-        for key in self.all_pressed_keys:
-            if key not in modifier_order:
-                keys.append(key)
-        
-        all_keys = modifiers + sorted(keys)
+        modifiers, keys = self._compute_partition()
+        all_keys = modifiers + keys
         display_text = " + ".join(k.title() for k in all_keys)
         
-        self.root.after(0, lambda: self._set_entry_text(display_text))
+        self._set_entry_text(display_text)
     
     def _set_entry_text(self, text: str):
-        """设置输入框文本（线程安全）"""
+        """设置输入框文本"""
         self.hotkey_entry.config(state=tk.NORMAL)
         self.hotkey_entry.delete(0, tk.END)
         self.hotkey_entry.insert(0, text)
@@ -265,27 +415,22 @@ class HotkeyDialog:
     
     def _finish_recording(self):
         """完成录制"""
-        if not self.all_pressed_keys:
+        if not self._modifiers_pressed and not self._normal_pressed:
             self._reset_recording()
             return
         
-        # 停止监听器
-        if self.listener:
-            try:
-                self.listener.stop()
-            except Exception as e:
-                log(f"Error stopping listener: {e}")
-            self.listener = None
+        # 停止接收按键
+        self._unbind_keys()
         
         # 验证热键（至少需要一个修饰键和一个普通键）
-        modifiers = {'ctrl', 'shift', 'alt', 'cmd'}
-        has_modifier = bool(self.all_pressed_keys & modifiers)
-        has_normal_key = bool(self.all_pressed_keys - modifiers)
+        has_modifier = bool(self._modifiers_pressed)
+        has_normal_key = bool(self._normal_pressed)
         
         if not has_modifier:
             messagebox.showwarning(
                 "无效热键",
-                "热键必须包含至少一个修饰键（Ctrl、Shift、Alt）"
+                "热键必须包含至少一个修饰键（Ctrl、Shift、Alt）",
+                parent=self.root
             )
             self._reset_recording()
             return
@@ -293,7 +438,8 @@ class HotkeyDialog:
         if not has_normal_key:
             messagebox.showwarning(
                 "无效热键",
-                "热键必须包含至少一个普通键"
+                "热键必须包含至少一个普通键",
+                parent=self.root
             )
             self._reset_recording()
             return
@@ -307,26 +453,17 @@ class HotkeyDialog:
     def _generate_hotkey_string(self) -> str:
         """生成热键字符串（pynput格式）"""
         # 排序：修饰键在前，普通键在后
-        modifiers = []
-        keys = []
-        
-        modifier_order = ['ctrl', 'shift', 'alt', 'cmd']
-        for mod in modifier_order:
-            if mod in self.all_pressed_keys:
-                modifiers.append(f"<{mod}>")
-        
-        for key in self.all_pressed_keys:
-            if key not in modifier_order:
-                # 特殊键需要用尖括号包裹
-                if len(key) > 1:
-                    keys.append(f"<{key}>")
-                else:
-                    keys.append(key)
-        
-        return "+".join(modifiers + sorted(keys))
+        modifiers, keys = self._compute_partition()
+        
+        parts = [f"<{m}>" for m in modifiers]
+        # 特殊键需要用尖括号包裹
+        parts.extend(f"<{k}>" if len(k) > 1 else k for k in keys)
+        
+        return "+".join(parts)
     
     def _enable_save_button(self):
         """启用保存按钮"""
+        self._unbind_keys()
         self.save_btn.config(state=tk.NORMAL)
         self.record_btn.config(text="重新录制", state=tk.NORMAL)
         self.recording = False
@@ -336,23 +473,21 @@ class HotkeyDialog:
         self.recording = False
         self.pressed_keys.clear()
         self.released_keys.clear()
-        self.all_pressed_keys.clear()
+        self._modifiers_pressed.clear()
+        self._normal_pressed.clear()
+        self._partition_dirty = True
+        self._pending_releases = 0
         self.record_btn.config(text="点击录制热键", state=tk.NORMAL)
         self.hotkey_entry.config(state=tk.NORMAL)
         self.hotkey_entry.delete(0, tk.END)
         self.hotkey_entry.config(state="readonly")
         
-        if self.listener:
-            try:
-                self.listener.stop()
-            except Exception as e:
-                log(f"Error stopping listener: {e}")
-            self.listener = None
+        self._unbind_keys()
     
     def _on_save(self):
         """保存热键"""
         if not self.new_hotkey:
-            messagebox.showwarning("提示", "请先录制新热键")
+            messagebox.showwarning("提示", "请先录制新热键", parent=self.root)
             return
         
         # 确认对话框
@@ -363,46 +498,60 @@ class HotkeyDialog:
             "更改将立即生效，是否继续？"
         )
         
-        if not messagebox.askyesno("确认更改", confirm_msg):
+        if not messagebox.askyesno("确认更改", confirm_msg, parent=self.root):
             return
         
         try:
             # 调用保存回调
             self.on_save(self.new_hotkey)
-            messagebox.showinfo("成功", f"热键已更新为：{self._format_hotkey(self.new_hotkey)}\n\n请使用新热键测试功能。")
+            messagebox.showinfo("成功", f"热键已更新为：{self._format_hotkey(self.new_hotkey)}\n\n请使用新热键测试功能。", parent=self.root)
             self._cleanup()
-            self.root.quit()
             self.root.destroy()
         except Exception as e:
             log(f"Failed to save hotkey: {e}")
-            messagebox.showerror("错误", f"保存热键失败：{str(e)}")
+            messagebox.showerror("错误", f"保存热键失败：{str(e)}", parent=self.root)
     
     def _cleanup(self):
         """清理资源"""
-        if self.listener:
+        self._unbind_keys()
+        if self._display_job is not None:
             try:
-                self.listener.stop()
-            except Exception as e:
-                log(f"Error stopping listener: {e}")
-            finally:
-                self.listener = None
+                self.root.after_cancel(self._display_job)
+            except tk.TclError:
+                pass
+            self._display_job = None
     
     def _on_close(self):
         """窗口关闭事件"""
         self._cleanup()
-        self.root.quit()
         self.root.destroy()
     
     def _on_cancel(self):
         """取消设置"""
         self._cleanup()
-        self.root.quit()
         self.root.destroy()
     
     def show(self):
-        """显示对话框"""
-        try:
-            self.root.mainloop()
-        finally:
-            # 确保清理监听器
-            self._cleanup()
+        """显示对话框（在 UI 线程中创建并运行，调用方阻塞到对话框关闭）"""
+        done = threading.Event()
+        errors = []
+        
+        def run(hidden_root: tk.Tk):
+            try:
+                self._build(hidden_root)
+                self.root.lift()
+                self.root.focus_force()
+                # 等待对话框关闭（UI 线程已在运行事件循环，不需要单独的 mainloop）
+                self.root.wait_window()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                # 确保解除按键绑定
+                if self.root is not None:
+                    self._cleanup()
+                done.set()
+        
+        _run_on_ui_thread(run)
+        done.wait()
+        if errors:
+            raise errors[0]
@@ -13,21 +13,19 @@ class HotkeyRunner:
         self.debounce_manager = DebounceManager()
         self.controller_callback = controller_callback
     
+    def _on_hotkey(self) -> None:
+        """热键触发回调"""
+        if app_state.enabled:
+            self.debounce_manager.trigger_async(self.controller_callback)
+    
     def start(self) -> None:
         """启动热键监听"""
-        hotkey = app_state.hotkey_str
-        
-        def on_hotkey():
-            if app_state.enabled:
-                self.debounce_manager.trigger_async(self.controller_callback)
-        
-        self.hotkey_manager.bind(hotkey, on_hotkey)
+        self.hotkey_manager.bind(app_state.hotkey_str, self._on_hotkey)
     
     def stop(self) -> None:
         """停止热键监听"""
         self.hotkey_manager.unbind()
     
     def restart(self) -> None:
-        """重启热键监听"""
-        self.stop()
-        self.start()
+        """重启热键监听（新热键无效时保留原绑定）"""
+        self.hotkey_manager.rebind(app_state.hotkey_str, self._on_hotkey)
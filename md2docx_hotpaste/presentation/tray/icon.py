@@ -6,6 +6,10 @@ from PIL import Image, ImageDraw
 from ...config.paths import get_app_png_path
 
 
+# 状态图标缓存：只有 ok=True/False 两种结果，首次使用时生成
+_STATUS_ICON_CACHE = {}
+
+
 def create_fallback_icon(ok: bool = True, flash: bool = False) -> Image.Image:
     """
     创建备用图标（当无法加载资源图标时使用）
@@ -28,7 +32,12 @@ def create_fallback_icon(ok: bool = True, flash: bool = False) -> Image.Image:
     # 状态色彩
     color = (60, 200, 80, 255) if ok else (220, 70, 70, 255)
     if flash:
-        color = tuple(min(255, int(c * 1.3)) if i < 3 else c for i, c in enumerate(color))
+        color = (
+            min(255, int(color[0] * 1.3)),
+            min(255, int(color[1] * 1.3)),
+            min(255, int(color[2] * 1.3)),
+            color[3],
+        )
     
     # 绘制圆形
     draw.ellipse([10, 10, 54, 54], fill=color)
@@ -41,7 +50,7 @@ def load_base_icon() -> Image.Image:
     加载基础图标
     
     Returns:
-        PIL 图像对象
+        PIL 图像对象（每次调用都是新的 RGBA 图像，可直接在其上绘制）
     """
     try:
         icon_path = get_app_png_path()
@@ -64,7 +73,8 @@ def create_status_icon(ok: bool) -> Image.Image:
     Returns:
         PIL 图像对象
     """
-    base = load_base_icon().copy()
+    # load_base_icon 每次返回新图像，无需再复制
+    base = load_base_icon()
     width, height = base.size
     draw = ImageDraw.Draw(base)
     
@@ -86,3 +96,19 @@ def create_status_icon(ok: bool) -> Image.Image:
     draw.ellipse([x1, y1, x2, y2], fill=status_color)
     
     return base
+
+
+def get_status_icon(ok: bool) -> Image.Image:
+    """
+    获取带状态指示的托盘图标（缓存版本，避免每次切换都重新读取和绘制 PNG）
+    
+    Args:
+        ok: 是否为正常状态
+        
+    Returns:
+        PIL 图像对象（共享实例，调用方不应修改）
+    """
+    icon = _STATUS_ICON_CACHE.get(ok)
+    if icon is None:
+        icon = _STATUS_ICON_CACHE[ok] = create_status_icon(ok)
+    return icon
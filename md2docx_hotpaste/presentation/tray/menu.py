@@ -1,5 +1,6 @@
 """Tray menu construction and callbacks."""
 
+import atexit
 import os
 import pystray
 import threading
@@ -7,16 +8,34 @@ import webbrowser
 
 from ... import __version__
 from ...core.state import app_state
+from ...config.defaults import DEFAULT_CONFIG
 from ...config.loader import ConfigLoader
 from ...config.paths import get_log_path, get_config_path
+from ...core.constants import CONFIG_SAVE_DELAY
 from ...domains.notification.manager import NotificationManager
 from ...utils.fs import ensure_dir
 from ...utils.logging import log
 from ...utils.version_checker import VersionChecker
-from .icon import create_status_icon
+from .icon import get_status_icon
 from ..hotkey.dialog import HotkeyDialog
 
 
+class _ConfigView:
+    """
+    配置的属性式只读视图
+    
+    始终读取 app_state.config 的当前字典（重载配置后仍然有效），
+    缺失的键回退到 DEFAULT_CONFIG 中的默认值
+    """
+    __slots__ = ()
+    
+    def __getattr__(self, key: str):
+        return app_state.config.get(key, DEFAULT_CONFIG.get(key))
+
+
+_cfg = _ConfigView()
+
+
 class TrayMenuManager:
     """托盘菜单管理器"""
     
@@ -27,16 +46,48 @@ class TrayMenuManager:
         self.version_checker = None  # 将由外部设置或按需创建
         self.latest_version = None  # 存储最新版本号
         self.latest_release_url = None  # 存储最新版本的下载链接
+        self._update_etag = None  # 上次"已是最新"检查的 ETag（仅保存在内存中，不写入用户配置）
+        self._cached_menu = None  # 缓存的菜单对象，仅在结构变化时重建
+        self._save_timer = None  # 待执行的延迟保存
+        self._save_lock = threading.Lock()
+        # 延迟保存的计时器是守护线程，任何方式退出前都要写入尚未落盘的修改
+        atexit.register(self._flush_save)
     
     def set_restart_hotkey_callback(self, callback):
         """设置重启热键的回调函数"""
         self.restart_hotkey_callback = callback
     
+    def get_menu(self) -> pystray.Menu:
+        """获取托盘菜单（首次调用时构建并缓存）"""
+        if self._cached_menu is None:
+            self._cached_menu = self.build_menu()
+        return self._cached_menu
+    
+    def invalidate_menu(self) -> None:
+        """标记菜单结构已变化，下次刷新或获取时重建"""
+        self._cached_menu = None
+    
+    def _refresh_menu(self, icon, rebuild: bool = False) -> None:
+        """
+        刷新托盘菜单
+        
+        勾选状态和热键文本都是回调，只需 update_menu 重新求值；
+        只有菜单结构变化（如发现新版本）时才重建菜单对象
+        
+        Args:
+            icon: pystray.Icon 实例
+            rebuild: 是否重建菜单结构
+        """
+        if rebuild:
+            self.invalidate_menu()
+        if self._cached_menu is None:
+            icon.menu = self.get_menu()
+        else:
+            icon.update_menu()
+    
     def build_menu(self) -> pystray.Menu:
         """构建托盘菜单"""
         
-        config = app_state.config
-        
         # 构建版本菜单项
         version_menu_items = [
             pystray.MenuItem(
@@ -66,7 +117,7 @@ class TrayMenuManager:
         return pystray.Menu(
             # 快捷显示
             pystray.MenuItem(
-                f"快捷键: {app_state.config['hotkey']}",
+                lambda item: f"快捷键: {_cfg.hotkey}",
                 lambda icon, item: None,
                 enabled=False
             ),
@@ -79,12 +130,12 @@ class TrayMenuManager:
             pystray.MenuItem(
                 "弹窗通知",
                 self._on_toggle_notify,
-                checked=lambda item: config.get("notify", True)
+                checked=lambda item: _cfg.notify
             ),
             pystray.MenuItem(
                 "无应用时自动打开",
                 self._on_toggle_auto_open,
-                checked=lambda item: config.get("auto_open_on_no_app", True)
+                checked=lambda item: _cfg.auto_open_on_no_app
             ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("设置热键", self._on_set_hotkey),
@@ -92,18 +143,18 @@ class TrayMenuManager:
             pystray.MenuItem(
                 "保留生成文件",
                 self._on_toggle_keep,
-                checked=lambda item: config.get("keep_file", False)
+                checked=lambda item: _cfg.keep_file
             ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(
                 "启动插入excel",
                 self._on_toggle_excel,
-                checked=lambda item: config.get("enable_excel", True)
+                checked=lambda item: _cfg.enable_excel
             ),
             pystray.MenuItem(
                 "启动excel解析特殊格式",
                 self._on_toggle_excel_format,
-                checked=lambda item: config.get("excel_keep_format", True)
+                checked=lambda item: _cfg.excel_keep_format
             ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("打开保存目录", self._on_open_save_dir),
@@ -120,10 +171,10 @@ class TrayMenuManager:
     def _on_toggle_enabled(self, icon, item):
         """切换热键启用状态"""
         app_state.enabled = not app_state.enabled
-        icon.icon = create_status_icon(ok=app_state.enabled)
+        icon.icon = get_status_icon(ok=app_state.enabled)
         
         status = "已启用热键" if app_state.enabled else "已暂停热键"
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         self.notification_manager.notify("MD2DOCX HotPaste", status, ok=app_state.enabled)
     
     def _on_set_hotkey(self, icon, item):
@@ -141,7 +192,7 @@ class TrayMenuManager:
                     self.restart_hotkey_callback()
                 
                 # 刷新菜单
-                icon.menu = self.build_menu()
+                self._refresh_menu(icon)
                 
                 log(f"Hotkey changed to: {new_hotkey}")
                 self.notification_manager.notify(
@@ -156,8 +207,7 @@ class TrayMenuManager:
                     ok=False)
                 raise
         
-        # 直接在主线程中显示对话框
-        # tkinter 必须在主线程中运行，不能使用后台线程
+        # 对话框在固定的 Tk UI 线程中运行，这里阻塞到对话框关闭
         try:
             dialog = HotkeyDialog(
                 current_hotkey=app_state.hotkey_str,
@@ -173,7 +223,7 @@ class TrayMenuManager:
         current = app_state.config.get("notify", True)
         app_state.config["notify"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         if app_state.config["notify"]:
             self.notification_manager.notify("MD2DOCX HotPaste", "已开启通知", ok=True)
         else:
@@ -184,7 +234,7 @@ class TrayMenuManager:
         current = app_state.config.get("auto_open_on_no_app", True)
         app_state.config["auto_open_on_no_app"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         status = "已开启无应用时自动打开" if app_state.config["auto_open_on_no_app"] else "已关闭无应用时自动打开"
         self.notification_manager.notify("MD2DOCX HotPaste", status, ok=True)
         
@@ -193,7 +243,7 @@ class TrayMenuManager:
         current = app_state.config.get("enable_excel", True)
         app_state.config["enable_excel"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         self.notification_manager.notify("MD2DOCX HotPaste", f"Excel 插入功能：{'开启' if not current else '关闭'}", ok=True)
         
     def _on_toggle_excel_format(self, icon, item):
@@ -201,7 +251,7 @@ class TrayMenuManager:
         current = app_state.config.get("excel_keep_format", True)
         app_state.config["excel_keep_format"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         self.notification_manager.notify("MD2DOCX HotPaste", f"Excel 格式保留：{'开启' if not current else '关闭'}", ok=True)
     
     def _on_toggle_keep(self, icon, item):
@@ -209,7 +259,7 @@ class TrayMenuManager:
         current = app_state.config.get("keep_file", False)
         app_state.config["keep_file"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         status = "保留文件：开启" if app_state.config["keep_file"] else "保留文件：关闭"
         self.notification_manager.notify("MD2DOCX HotPaste", status, ok=True)
     
@@ -223,27 +273,30 @@ class TrayMenuManager:
     def _on_open_log(self, icon, item):
         """打开日志文件"""
         log_path = get_log_path()
-        if not os.path.exists(log_path):
-            # 创建空日志文件
-            open(log_path, "w", encoding="utf-8").close()
+        # 不存在时创建空日志文件（O_CREAT 不截断已有内容，省去单独的 exists 检查）
+        os.close(os.open(log_path, os.O_WRONLY | os.O_CREAT, 0o644))
         os.startfile(log_path)
     
     def _on_edit_config(self, icon, item):
         """编辑配置文件"""
         config_path = get_config_path()
+        # 先写入尚未落盘的修改，保证编辑器打开的是最新配置
+        self._flush_save()
         if not os.path.exists(config_path):
-            self._save_config()  # 创建默认配置文件
+            self._write_config()  # 创建默认配置文件
         os.startfile(config_path)
     
     def _on_reload(self, icon, item):
         """重载配置和热键"""
         try:
+            # 先写入尚未落盘的修改，否则刚切换的选项会被磁盘上的旧配置覆盖
+            self._flush_save()
             app_state.config = self.config_loader.load()
             app_state.hotkey_str = app_state.config.get("hotkey", "<ctrl>+b")
             
             if self.restart_hotkey_callback:
                 self.restart_hotkey_callback()
-            icon.menu = self.build_menu()
+            self._refresh_menu(icon)
             self.notification_manager.notify("MD2DOCX HotPaste", "配置已重载", ok=True)
         except Exception as e:
             log(f"Failed to reload config: {e}")
@@ -258,7 +311,8 @@ class TrayMenuManager:
                 from ... import __version__
                 
                 checker = VersionChecker(__version__)
-                result = checker.check_update()
+                # 只有上次检查结果为"已是最新"时才会保存 ETag，因此 304 即表示仍无更新
+                result = checker.check_update(etag=self._update_etag)
                 
                 if result is None:
                     # 网络错误或检查失败
@@ -269,6 +323,9 @@ class TrayMenuManager:
                         ok=False
                     )
                 elif result.get("has_update"):
+                    # 有更新时不保留 ETag，下次检查仍获取完整信息
+                    self._update_etag = None
+                    
                     latest_version = result.get("latest_version")
                     release_url = result.get("release_url")
                     
@@ -292,6 +349,9 @@ class TrayMenuManager:
                     log(f"New version available: {latest_version}")
                     log(f"Download URL: {release_url}")
                 else:
+                    # 记录 ETag，下次检查可使用条件请求
+                    self._update_etag = checker.etag
+                    
                     # 无需更新，通知用户已是最新版本
                     current_version = result.get("current_version")
                     log(f"Already on latest version: {current_version}")
@@ -330,15 +390,37 @@ class TrayMenuManager:
         """更新最新版本信息"""
         self.latest_version = latest_version
         self.latest_release_url = release_url
-        icon.menu = self.build_menu()
+        # 新版本提示是新增的菜单项，需要重建菜单结构
+        self.invalidate_menu()
+        self._refresh_menu(icon)
     
     def _on_quit(self, icon, item):
         """退出应用程序"""
+        # 退出前同步写入尚未落盘的配置
+        self._flush_save()
         icon.stop()
     
     def _save_config(self):
-        """保存配置"""
+        """保存配置（防抖：最后一次修改后 CONFIG_SAVE_DELAY 秒才写盘，连续切换只写一次，不阻塞菜单回调）"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(CONFIG_SAVE_DELAY, self._flush_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush_save(self):
+        """立即执行待处理的延迟保存（没有待保存内容时不做任何事）"""
+        with self._save_lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            self._write_config()
+    
+    def _write_config(self):
+        """将当前配置的快照写入磁盘"""
         try:
-            self.config_loader.save(app_state.config)
+            self.config_loader.save(dict(app_state.config))
         except Exception as e:
             log(f"Failed to save config: {e}")
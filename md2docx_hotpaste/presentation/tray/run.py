@@ -3,7 +3,7 @@
 import pystray
 
 from ...core.state import app_state
-from .icon import create_status_icon
+from .icon import get_status_icon
 from .menu import TrayMenuManager
 
 
@@ -16,14 +16,14 @@ class TrayRunner:
     def run(self, app_name: str = "MD2DOCX HotPaste") -> None:
         """启动托盘图标"""
         # 创建初始图标
-        tray_icon = create_status_icon(ok=True)
+        tray_icon = get_status_icon(ok=True)
         
         # 创建托盘实例
         icon = pystray.Icon(
             app_name,
             tray_icon,
             app_name,
-            self.menu_manager.build_menu()
+            self.menu_manager.get_menu()
         )
         
         # 保存图标实例到全局状态
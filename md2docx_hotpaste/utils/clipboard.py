@@ -1,9 +1,23 @@
 """Clipboard operations."""
 
+from typing import Optional
+
 import pyperclip
 from ..core.errors import ClipboardError
 
 
+# 已解析的剪贴板读取函数（首次使用时解析一次，避免每次经过 pyperclip 的延迟分派）
+_paste = None
+
+
+def _get_paste_func():
+    """获取 pyperclip 解析后的剪贴板读取函数"""
+    global _paste
+    if _paste is None:
+        _, _paste = pyperclip.determine_clipboard()
+    return _paste
+
+
 def get_clipboard_text() -> str:
     """
     获取剪贴板文本内容
@@ -15,7 +29,7 @@ def get_clipboard_text() -> str:
         ClipboardError: 剪贴板操作失败时
     """
     try:
-        text = pyperclip.paste()
+        text = _get_paste_func()()
         if text is None:
             return ""
         return text
@@ -23,15 +37,19 @@ def get_clipboard_text() -> str:
         raise ClipboardError(f"Failed to read clipboard: {e}")
 
 
-def is_clipboard_empty() -> bool:
+def is_clipboard_empty(text: Optional[str] = None) -> bool:
     """
     检查剪贴板是否为空
     
+    Args:
+        text: 已读取的剪贴板内容；为 None 时重新读取剪贴板
+    
     Returns:
         True 如果剪贴板为空或只包含空白字符
     """
     try:
-        text = get_clipboard_text()
+        if text is None:
+            text = get_clipboard_text()
         return not text or not text.strip()
     except ClipboardError:
         return True
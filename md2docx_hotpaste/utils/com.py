@@ -2,6 +2,73 @@
 
 import pythoncom
 from functools import wraps
+from win32com.client import CoClassBaseClass, DispatchBaseClass, gencache
+from typing import List, Optional
+
+
+def co_initialize() -> bool:
+    """
+    初始化当前线程的 COM 环境
+    
+    如果线程已用其他并发模型初始化（RPC_E_CHANGED_MODE），CoInitialize 会失败，
+    此时线程的 COM 已可用，且不能再调用 CoUninitialize 配对
+    
+    Returns:
+        True 如果调用方需要在结束时调用 CoUninitialize
+    """
+    try:
+        pythoncom.CoInitialize()
+    except pythoncom.com_error:
+        return False
+    return True
+
+
+def co_uninitialize() -> None:
+    """释放一次 co_initialize 成功的 COM 初始化（静默处理清理异常）"""
+    try:
+        pythoncom.CoUninitialize()
+    except Exception:
+        pass
+
+
+def order_prog_ids(prog_ids: List[str], last: Optional[str]) -> List[str]:
+    """
+    按尝试顺序排列 ProgID：上次连接成功的排在最前
+    
+    Args:
+        prog_ids: 候选 ProgID 列表
+        last: 上次连接成功的 ProgID
+        
+    Returns:
+        排序后的 ProgID 列表
+    """
+    if last is None or last == prog_ids[0]:
+        return prog_ids
+    return [last] + [prog_id for prog_id in prog_ids if prog_id != last]
+
+
+def early_bound(obj):
+    """
+    已有 makepy 生成的包装类时返回早期绑定对象，否则原样返回动态调度对象
+    
+    只查找现有的 gen_py 缓存，不在粘贴过程中运行 makepy 生成包装类
+    （首次生成耗时数秒，且冻结包中的目录可能不可写）
+    
+    Args:
+        obj: win32com 调度对象
+        
+    Returns:
+        早期绑定对象或原对象
+    """
+    if isinstance(obj, (DispatchBaseClass, CoClassBaseClass)):
+        return obj
+    try:
+        oleobj = obj._oleobj_
+        iid = oleobj.GetTypeInfo().GetTypeAttr()[0]
+        klass = gencache.GetClassForCLSID(iid)
+    except Exception:
+        return obj
+    return klass(oleobj) if klass is not None else obj
 
 
 def ensure_com(func):
@@ -12,13 +79,10 @@ def ensure_com(func):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        pythoncom.CoInitialize()
+        needs_uninit = co_initialize()
         try:
             return func(*args, **kwargs)
         finally:
-            try:
-                pythoncom.CoUninitialize()
-            except Exception:
-                # 静默处理清理异常
-                pass
+            if needs_uninit:
+                co_uninitialize()
     return wrapper
@@ -3,6 +3,34 @@
 import re
 
 
+# 匹配 \[ 开始到 \] 结束的公式块
+_BLOCK_PATTERN = re.compile(r'\\\[(.*?)\\\]', re.DOTALL)
+# 匹配 \( 开始到 \) 结束的行内公式
+_INLINE_PATTERN = re.compile(r'\\\((.*?)\\\)', re.DOTALL)
+# 两种公式同时出现时一次扫描完成（group 1 为块级公式，group 2 为行内公式）
+_LATEX_PATTERN = re.compile(r'\\\[(.*?)\\\]|\\\((.*?)\\\)', re.DOTALL)
+
+
+def _replace_block(match: re.Match) -> str:
+    """\\[...\\] -> $$...$$"""
+    formula = match.group(1).strip()
+    return f"$$\n{formula}\n$$"
+
+
+def _replace_inline(match: re.Match) -> str:
+    """\\(...\\) -> $...$"""
+    formula = match.group(1).strip()
+    return f"${formula}$"
+
+
+def _replace_any(match: re.Match) -> str:
+    """按匹配到的分组分派到块级或行内公式的替换"""
+    if match.group(1) is not None:
+        return _replace_block(match)
+    formula = match.group(2).strip()
+    return f"${formula}$"
+
+
 def convert_latex_delimiters(text: str) -> str:
     """
     将 LaTeX 块级公式格式 \\[...\\] 转换为 Pandoc 支持的 $$...$$ 格式
@@ -14,18 +42,14 @@ def convert_latex_delimiters(text: str) -> str:
     Returns:
         转换后的文本
     """
-    # 匹配 \[ 开始到 \] 结束的公式块
-    pattern = r'\\\[(.*?)\\\]'
-    inline_pattern = r'\\\((.*?)\\\)'
-
-    def replace_match(match):
-        formula = match.group(1).strip()
-        return f"$$\n{formula}\n$$"
-
-    def replace_inline_match(match):
-        formula = match.group(1).strip()
-        return f"${formula}$"
-
-    text = re.sub(pattern, replace_match, text, flags=re.DOTALL)
-    text = re.sub(inline_pattern, replace_inline_match, text, flags=re.DOTALL)
+    # 绝大多数粘贴内容不含 \[ 或 \(：每种公式只在出现其起始符时才跑对应的正则
+    has_block = "\\[" in text
+    has_inline = "\\(" in text
+    if has_block and has_inline:
+        # 两种都有时用一个交替正则只扫描一遍
+        return _LATEX_PATTERN.sub(_replace_any, text)
+    if has_block:
+        return _BLOCK_PATTERN.sub(_replace_block, text)
+    if has_inline:
+        return _INLINE_PATTERN.sub(_replace_inline, text)
     return text
@@ -4,14 +4,21 @@ from datetime import datetime
 from ..config.paths import get_log_path
 
 
+# 日志路径只解析一次，避免每条日志都检查/创建数据目录；写入失败时重置，下次重新解析
+_log_path = None
+
+
 def log(message: str) -> None:
     """记录日志到文件"""
+    global _log_path
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_line = f"[{timestamp}] {message}\n"
     
     try:
-        with open(get_log_path(), "a", encoding="utf-8") as f:
+        if _log_path is None:
+            _log_path = get_log_path()
+        with open(_log_path, "a", encoding="utf-8") as f:
             f.write(log_line)
     except Exception:
         # 记录日志失败时静默处理，避免递归错误
-        pass
+        _log_path = None
@@ -2,8 +2,14 @@
 
 import os
 import sys
+from functools import lru_cache
 
 
+# 开发环境下的项目根目录（导入时计算一次）
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
     """
     获取资源文件的绝对路径，支持 PyInstaller 打包后的环境
@@ -19,5 +25,4 @@ def resource_path(relative_path: str) -> str:
         return os.path.join(sys._MEIPASS, relative_path)
     
     # 开发环境：相对于项目根目录
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    return os.path.join(base_dir, relative_path)
+    return os.path.join(_BASE_DIR, relative_path)
@@ -22,25 +22,38 @@ class VersionChecker:
             current_version: 当前应用版本号
         """
         self.current_version = current_version
+        self.etag: Optional[str] = None  # 最近一次响应的 ETag
     
-    def check_update(self) -> Optional[Dict[str, Any]]:
+    def check_update(self, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         检查是否有新版本
         
+        Args:
+            etag: 上次检查得到的 ETag；服务器返回 304 时跳过下载和解析
+        
         Returns:
             如果有新版本，返回包含以下字段的字典：
             - has_update: bool, 是否有更新
             - latest_version: str, 最新版本号
             - release_url: str, 发布页面链接
             - release_notes: str, 发布说明
+            - not_modified: bool, 最新 release 自上次检查后未变化（仅 304 时存在）
             如果检查失败或无更新，返回 None
         """
         try:
             # 获取最新版本信息
-            latest_info = self._fetch_latest_release()
+            latest_info = self._fetch_latest_release(etag)
             if not latest_info:
                 return None
             
+            if latest_info.get("not_modified"):
+                log("Latest release not modified since last check")
+                return {
+                    "has_update": False,
+                    "not_modified": True,
+                    "current_version": self.current_version
+                }
+            
             latest_version = latest_info.get("tag_name", "").lstrip("v")
             if not latest_version:
                 log("Failed to parse latest version from GitHub")
@@ -67,27 +80,38 @@ class VersionChecker:
             log(f"Version check failed: {e}")
             return None
     
-    def _fetch_latest_release(self) -> Optional[Dict[str, Any]]:
+    def _fetch_latest_release(self, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         从 GitHub API 获取最新 release 信息
         
+        Args:
+            etag: 上次响应的 ETag，用于条件请求（If-None-Match）
+        
         Returns:
-            包含 release 信息的字典，失败返回 None
+            包含 release 信息的字典；未变化时返回 {"not_modified": True}；失败返回 None
         """
         try:
-            req = urllib.request.Request(
-                self.GITHUB_API_URL,
-                headers={"User-Agent": "MD2DOCX-HotPaste"}
-            )
+            headers = {"User-Agent": "MD2DOCX-HotPaste"}
+            if etag:
+                headers["If-None-Match"] = etag
+            req = urllib.request.Request(self.GITHUB_API_URL, headers=headers)
             
             with urllib.request.urlopen(req, timeout=self.TIMEOUT) as response:
                 if response.status == 200:
+                    self.etag = response.headers.get("ETag")
                     data = json.loads(response.read().decode("utf-8"))
                     return data
                 else:
                     log(f"GitHub API returned status code: {response.status}")
                     return None
                     
+        except urllib.error.HTTPError as e:
+            # 304：内容未变化，无响应体（且不计入未认证请求的速率限制）
+            if e.code == 304:
+                self.etag = etag
+                return {"not_modified": True}
+            log(f"GitHub API returned status code: {e.code}")
+            return None
         except urllib.error.URLError as e:
             log(f"Network error while checking version: {e}")
             return None
@@ -1,10 +1,27 @@
 """Windows application detection utilities."""
 
+from typing import Optional
+
 import win32com.client
-from .window import get_foreground_process_name, get_foreground_window_title
+from .window import (
+    get_foreground_window,
+    get_foreground_process_name,
+    get_foreground_window_title,
+    get_foreground_window_class,
+)
 from ..logging import log
 
 
+# 前台窗口类名 -> 目标应用（WPS 专有的主窗口类名，优先于进程名判断）
+# 不包含 OpusApp / XLMAIN：独立的 WPS 文字 / 表格进程也注册这两个类名以兼容 Office，
+# 只凭类名会被误判为 Word / Excel，这类窗口交给进程名判断
+_WINDOW_CLASS_TARGETS = {
+    "KWPS": "wps",
+    "ET_MAIN": "wps_excel",
+    "KET_Main": "wps_excel",
+}
+
+
 def detect_active_app() -> str:
     """
     检测当前活跃的插入目标应用
@@ -12,7 +29,18 @@ def detect_active_app() -> str:
     Returns:
         "word", "wps", "excel", "wps_excel" 或空字符串
     """
-    process_name = get_foreground_process_name()
+    # 整个检测过程只取一次前台窗口句柄
+    hwnd = get_foreground_window()
+    
+    # 快速路径：按窗口类名识别，无需查询进程信息
+    window_class = get_foreground_window_class(hwnd)
+    target = _WINDOW_CLASS_TARGETS.get(window_class)
+    if target:
+        log(f"前台窗口类名: {window_class}")
+        return target
+    
+    # 其他类名（Office 兼容类名、WPS 统一进程等），回退到进程名判断
+    process_name = get_foreground_process_name(hwnd)
     log(f"前台进程名称: {process_name}")
     
     if "winword" in process_name:
@@ -23,20 +51,23 @@ def detect_active_app() -> str:
         return "wps_excel"
     elif "wps" in process_name:  # WPS Office 统一进程
         # 需要进一步区分是文字还是表格
-        return detect_wps_type()
+        return detect_wps_type(hwnd)
     else:
         return ""
 
 
-def detect_wps_type() -> str:
+def detect_wps_type(hwnd: Optional[int] = None) -> str:
     """
     检测 WPS 应用的具体类型 (文字/表格)
     通过获取前台窗口的 COM 对象来精确判断
     
+    Args:
+        hwnd: 已获取的前台窗口句柄；为 None 时重新获取
+    
     Returns:
         "wps" (文字), "wps_excel" (表格) 或空字符串
     """
-    window_title = get_foreground_window_title()
+    window_title = get_foreground_window_title(hwnd)
     log(f"WPS 窗口标题: {window_title}")
     
     # 方法1: 通过 COM 对象判断(最准确)
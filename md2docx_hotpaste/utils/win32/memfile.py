@@ -2,7 +2,7 @@
 import os, tempfile, time
 import win32file, win32con
 
-from md2docx_hotpaste.core.constants import DEFAULT_DELETE_RETRY, DEFAULT_DELETE_WAIT
+from md2docx_hotpaste.core.constants import DEFAULT_DELETE_BACKOFF
 
 
 class EphemeralFile:
@@ -45,14 +45,52 @@ class EphemeralFile:
                 self.handle = None
         except Exception:
             pass
-        # 手动删除（多次重试，兼容杀软/索引器短占用）
-        for _ in range(DEFAULT_DELETE_RETRY):
+        # 手动删除：先直接删
+        try:
+            os.remove(self.path)
+            return
+        except FileNotFoundError:
+            return
+        except OSError:
+            pass
+        # 被占用（杀软/索引器短占用）：把删除交给系统，最后一个句柄关闭时自动删除，不再轮询等待
+        if self._delete_on_close():
+            return
+        # 占用方不允许共享删除时才退避重试
+        for delay in DEFAULT_DELETE_BACKOFF:
+            time.sleep(delay)
             try:
-                if os.path.exists(self.path):
-                    os.remove(self.path)
-                break
-            except Exception:
-                time.sleep(DEFAULT_DELETE_WAIT)
+                os.remove(self.path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                continue
+        # 仍然删不掉：登记为重启后删除（需要相应权限，失败则留给系统临时目录清理）
+        try:
+            win32file.MoveFileEx(self.path, None, win32file.MOVEFILE_DELAY_UNTIL_REBOOT)
+        except Exception:
+            pass
+
+    def _delete_on_close(self) -> bool:
+        """以 FILE_FLAG_DELETE_ON_CLOSE 打开并立即关闭，文件在所有句柄关闭后由系统删除"""
+        try:
+            handle = win32file.CreateFile(
+                self.path,
+                win32con.DELETE,
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                None,
+                win32con.OPEN_EXISTING,
+                win32file.FILE_FLAG_DELETE_ON_CLOSE,
+                None
+            )
+        except Exception:
+            return False
+        try:
+            win32file.CloseHandle(handle)
+        except Exception:
+            pass
+        return True
 
     def __enter__(self):
         return self
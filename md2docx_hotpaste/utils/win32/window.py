@@ -1,7 +1,14 @@
 """Windows window and process API utilities."""
 
+import ctypes
+import functools
 import os
+import sys
+from ctypes import wintypes
+from typing import Optional
+
 import psutil
+import win32api
 import win32gui
 import win32process
 from ..logging import log
@@ -21,36 +28,105 @@ def get_foreground_window() -> int:
         return 0
 
 
-def get_foreground_process_name() -> str:
+# 只允许查询映像路径等少量信息，对提权进程也能打开
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_kernel32.QueryFullProcessImageNameW.argtypes = [
+    wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+]
+_kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+
+
+def _image_path_for_pid(pid: int) -> str:
+    """
+    直接通过 Win32 API 查询进程映像路径
+    
+    QueryFullProcessImageNameW 只需要 PROCESS_QUERY_LIMITED_INFORMATION，
+    对提权/受保护进程同样有效（GetModuleFileNameEx 需要 PROCESS_VM_READ）
+    
+    Args:
+        pid: 进程 ID
+        
+    Returns:
+        进程映像完整路径
+        
+    Raises:
+        OSError: 查询失败时
+    """
+    handle = win32api.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    try:
+        size = wintypes.DWORD(32768)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not _kernel32.QueryFullProcessImageNameW(int(handle), 0, buffer, ctypes.byref(size)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return buffer.value
+    finally:
+        win32api.CloseHandle(handle)
+
+
+@functools.lru_cache(maxsize=64)
+def _exe_for_window(hwnd: int, pid: int) -> str:
+    """
+    查询窗口所属进程的映像名（小写 basename，已驻留）
+    
+    前台窗口在一次热键处理中常被反复查询，结果按 (hwnd, pid) 缓存：
+    同时匹配窗口句柄和 PID 才会命中，PID 被新进程复用时不会返回旧名称。
+    查询失败时抛出异常，失败结果不会进入缓存
+    
+    Args:
+        hwnd: 窗口句柄
+        pid: 窗口所属进程 ID
+        
+    Returns:
+        进程名称（小写）
+    """
+    try:
+        path = _image_path_for_pid(pid)
+    except Exception:
+        # 极少数无法打开的进程（如系统进程）才走 psutil；失败由调用方统一记录
+        path = psutil.Process(pid).exe()
+    # 驻留后与常量进程名比较时可直接命中指针相等
+    return sys.intern(os.path.basename(path).lower())
+
+
+def get_foreground_process_name(hwnd: Optional[int] = None) -> str:
     """
     获取当前前台进程的名称
     
+    Args:
+        hwnd: 已获取的前台窗口句柄；为 None 时重新获取
+    
     Returns:
         进程名称（小写），失败时返回空字符串
     """
     try:
-        hwnd = get_foreground_window()
+        if hwnd is None:
+            hwnd = get_foreground_window()
         if not hwnd:
             return ""
         
         _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        process = psutil.Process(pid)
-        return os.path.basename(process.exe()).lower()
+        return _exe_for_window(hwnd, pid)
         
     except Exception as e:
         log(f"Failed to get foreground process: {e}")
         return ""
 
 
-def get_foreground_window_title() -> str:
+def get_foreground_window_title(hwnd: Optional[int] = None) -> str:
     """
     获取当前前台窗口标题
     
+    Args:
+        hwnd: 已获取的前台窗口句柄；为 None 时重新获取
+    
     Returns:
         窗口标题，失败时返回空字符串
     """
     try:
-        hwnd = get_foreground_window()
+        if hwnd is None:
+            hwnd = get_foreground_window()
         if not hwnd:
             return ""
         return win32gui.GetWindowText(hwnd)
@@ -59,6 +135,27 @@ def get_foreground_window_title() -> str:
         return ""
 
 
+def get_foreground_window_class(hwnd: Optional[int] = None) -> str:
+    """
+    获取当前前台窗口类名（单次 USER32 调用，无需打开进程句柄）
+    
+    Args:
+        hwnd: 已获取的前台窗口句柄；为 None 时重新获取
+    
+    Returns:
+        窗口类名，失败时返回空字符串
+    """
+    try:
+        if hwnd is None:
+            hwnd = get_foreground_window()
+        if not hwnd:
+            return ""
+        return win32gui.GetClassName(hwnd)
+    except Exception as e:
+        log(f"Failed to get window class: {e}")
+        return ""
+
+
 def cleanup_background_wps_processes(ep:int = 0) -> int:
     """
     清理后台的 WPS 进程，保留前台的 WPS 进程